@@ -0,0 +1,21 @@
+from typing import Type
+
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+
+
+class LazySerializerMixin:
+    """
+    Класс LazySerializerMixin - примесь для представлений на основе класса GenericAPIView из модуля
+    rest_framework.generics. Атрибут serializer_class может быть строкой с полным путем к классу сериализатора:
+    модуль сериализаторов импортируется при первом запросе к представлению, а не при загрузке конфигурации URL.
+    """
+
+    def get_serializer_class(self) -> Type[serializers.BaseSerializer]:
+        """
+        Функция get_serializer_class переопределяет метод базового класса. Возвращает класс сериализатора,
+        импортируя его по пути, если serializer_class задан строкой.
+        """
+        if isinstance(self.serializer_class, str):
+            return import_string(self.serializer_class)
+        return super().get_serializer_class()
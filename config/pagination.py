@@ -0,0 +1,11 @@
+from django.conf import settings
+from rest_framework.pagination import LimitOffsetPagination
+
+
+class CappedLimitOffsetPagination(LimitOffsetPagination):
+    """
+    Класс CappedLimitOffsetPagination наследуется от класса LimitOffsetPagination из модуля rest_framework.pagination.
+    Всегда разбивает списки на страницы: без параметра limit возвращается PAGE_SIZE записей,
+    а значения limit больше MAX_PAGE_SIZE ограничиваются этим значением.
+    """
+    max_limit: int = settings.MAX_PAGE_SIZE
@@ -0,0 +1,24 @@
+from typing import Any
+
+import msgpack
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class MessagePackParser(BaseParser):
+    """
+    Класс MessagePackParser наследуется от класса BaseParser из модуля rest_framework.parsers.
+    Разбирает тело запроса с типом содержимого "application/msgpack". Значения расширения Timestamp
+    преобразуются в объекты datetime в часовом поясе UTC.
+    """
+    media_type: str = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None) -> Any:
+        """
+        Функция parse переопределяет метод базового класса. Возвращает распакованные данные запроса,
+        вызывает исключение ParseError, если тело запроса не является корректным MessagePack.
+        """
+        try:
+            return msgpack.unpackb(stream.read(), raw=False, timestamp=3, strict_map_key=False)
+        except (ValueError, TypeError, msgpack.UnpackException) as exc:
+            raise ParseError('MessagePack parse error - %s' % exc)
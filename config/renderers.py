@@ -0,0 +1,50 @@
+import datetime
+import decimal
+import uuid
+from typing import Any
+
+import msgpack
+from django.utils import timezone
+from rest_framework.renderers import BaseRenderer
+
+EPOCH: datetime.datetime = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def encode_msgpack(obj: Any) -> Any:
+    """
+    The encode_msgpack function is a utility function. It is called by the MessagePack packer for objects
+    that have no native MessagePack type. Datetimes, which serializers return as is (DATETIME_FORMAT is None),
+    are packed as the Timestamp extension type with exact microseconds; dates, times, decimals and UUIDs
+    as strings. Serializers already return decimals as strings, so they are not more compact than in JSON.
+    """
+    if isinstance(obj, datetime.datetime):
+        if timezone.is_naive(obj):
+            obj = timezone.make_aware(obj, datetime.timezone.utc)
+        delta: datetime.timedelta = obj - EPOCH
+        return msgpack.Timestamp(delta.days * 86400 + delta.seconds, delta.microseconds * 1000)
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, (decimal.Decimal, uuid.UUID)):
+        return str(obj)
+    raise TypeError('Object of type %s is not MessagePack serializable' % type(obj).__name__)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Класс MessagePackRenderer наследуется от класса BaseRenderer из модуля rest_framework.renderers.
+    Сериализует ответ в двоичный формат MessagePack: числа и даты со временем передаются без преобразования
+    в строки, десятичные числа - строками, как и в JSON. Выбирается при согласовании содержимого
+    по заголовку "Accept: application/msgpack" или параметром запроса "?format=msgpack".
+    """
+    media_type: str = 'application/msgpack'
+    format: str = 'msgpack'
+    charset = None
+    render_style: str = 'binary'
+
+    def render(self, data: Any, accepted_media_type=None, renderer_context=None) -> bytes:
+        """
+        Функция render переопределяет метод базового класса. Возвращает данные ответа, упакованные в MessagePack.
+        """
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=encode_msgpack, use_bin_type=True)
@@ -0,0 +1,112 @@
+import functools
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Tuple, Type, Union
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.utils.module_loading import import_string
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views import View
+from rest_framework import serializers
+from rest_framework.schemas.openapi import AutoSchema, SchemaGenerator
+
+SCHEMA_TITLE: str = 'Trade network API'
+SCHEMA_MEDIA_TYPE: str = 'application/vnd.oai.openapi+json'
+
+
+class QueryParametersSchema(AutoSchema):
+    """
+    Класс QueryParametersSchema наследуется от класса AutoSchema из модуля rest_framework.schemas.openapi.
+    Описывает в схеме параметры запроса представлений, проверяющих их отдельным сериализатором query_serializer.
+    Сериализатор можно указать строкой с полным путем к классу, тогда он импортируется только при генерации схемы.
+    """
+
+    def __init__(self, query_serializer: Union[str, Type[serializers.Serializer]], **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.query_serializer: Union[str, Type[serializers.Serializer]] = query_serializer
+
+    def get_filter_parameters(self, path: str, method: str) -> List[Dict[str, Any]]:
+        """
+        Функция get_filter_parameters переопределяет метод базового класса и добавляет к параметрам фильтров
+        поля сериализатора параметров запроса.
+        """
+        parameters: List[Dict[str, Any]] = super().get_filter_parameters(path, method)
+        query_serializer = self.query_serializer
+        if isinstance(query_serializer, str):
+            query_serializer = import_string(query_serializer)
+        for name, field in query_serializer().fields.items():
+            parameters.append({
+                'name': name,
+                'required': field.required,
+                'in': 'query',
+                'description': str(field.help_text or ''),
+                'schema': self.map_field(field),
+            })
+        return parameters
+
+
+def build_schema() -> Dict[str, Any]:
+    """
+    The build_schema function generates the OpenAPI schema of every endpoint of the project, including
+    the pagination and filter query parameters, by introspecting the URL configuration and the views.
+    """
+    generator = SchemaGenerator(title=SCHEMA_TITLE, version=settings.API_VERSION)
+    return generator.get_schema(request=None, public=True)
+
+
+def write_schema(path: str) -> bytes:
+    """
+    The write_schema function generates the schema and writes it to the file atomically, so a server
+    reading the file never sees it half-written. Returns the written content.
+    """
+    content: bytes = json.dumps(build_schema(), ensure_ascii=False, sort_keys=True).encode()
+    directory: str = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temporary: str = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as file:
+        file.write(content)
+    os.replace(temporary, path)
+    return content
+
+
+@functools.lru_cache(maxsize=1)
+def load_schema() -> Tuple[bytes, str]:
+    """
+    The load_schema function returns the schema content and its ETag. The artifact written by the build_schema
+    command is read once per process; if it is missing, the schema is generated on first use and written
+    for the other processes, or kept in memory only if the file cannot be written.
+    """
+    path: str = str(settings.OPENAPI_SCHEMA_PATH)
+    try:
+        with open(path, 'rb') as file:
+            content: bytes = file.read()
+    except FileNotFoundError:
+        try:
+            content = write_schema(path)
+        except OSError:
+            content = json.dumps(build_schema(), ensure_ascii=False, sort_keys=True).encode()
+    return content, f'"{hashlib.md5(content).hexdigest()}"'
+
+
+class SchemaView(View):
+    """
+    Класс SchemaView наследуется от класса View из модуля django.views и представляет собой представление
+    на основе класса для обработки запросов методом GET по адресу '/schema'. Возвращает OpenAPI схему из
+    кэшированного файла без генерации на каждый запрос; повторный запрос с заголовком If-None-Match
+    получает ответ 304.
+    """
+    http_method_names: list = ['get', 'head']
+
+    def get(self, request: HttpRequest) -> HttpResponse:
+        """
+        Функция get возвращает содержимое схемы или ответ 304 с заголовками ETag и Cache-Control.
+        """
+        content, etag = load_schema()
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(content, content_type=SCHEMA_MEDIA_TYPE)
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=settings.OPENAPI_SCHEMA_MAX_AGE)
+        return response
@@ -33,7 +33,9 @@ ALLOWED_HOSTS = ['*', ]
 # Application definition
 
 INSTALLED_APPS = [
-    'django.contrib.admin',
+    # admin modules are imported by admin.autodiscover() in config/urls.py on the first request,
+    # so management commands and job workers do not load them
+    'django.contrib.admin.apps.SimpleAdminConfig',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
@@ -45,6 +47,8 @@ INSTALLED_APPS = [
 
     'users',
     'trade_network',
+    'jobs',
+    'diagnostics',
 
 ]
 
@@ -56,6 +60,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'diagnostics.middleware.SlowQueryMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -116,7 +121,68 @@ REST_FRAMEWORK = {
         'rest_framework.authentication.BasicAuthentication',
         'rest_framework.authentication.SessionAuthentication'
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+        'config.renderers.MessagePackRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'rest_framework.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+        'config.parsers.MessagePackParser',
+    ],
+    # Serializers return datetimes as is: the JSON renderer writes them in ISO 8601 as before,
+    # the MessagePack renderer packs them as the Timestamp extension type
+    'DATETIME_FORMAT': None,
+    'DEFAULT_PAGINATION_CLASS': 'config.pagination.CappedLimitOffsetPagination',
+    'PAGE_SIZE': 100,
+    'DEFAULT_THROTTLE_CLASSES': [
+        'config.throttling.TokenBucketThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'users': os.environ.get('THROTTLE_RATE_USERS', '30/min'),
+        'trade_network': os.environ.get('THROTTLE_RATE_TRADE_NETWORK', '300/min'),
+        'jobs': os.environ.get('THROTTLE_RATE_JOBS', '120/min'),
+    },
+}
+
+# OpenAPI schema served at /schema: generated into the file by `python manage.py build_schema`,
+# or on first request if the file is missing
+
+API_VERSION = '1.0.0'
+OPENAPI_SCHEMA_PATH = os.environ.get('OPENAPI_SCHEMA_PATH', BASE_DIR / 'openapi.json')
+OPENAPI_SCHEMA_MAX_AGE = int(os.environ.get('OPENAPI_SCHEMA_MAX_AGE', 3600))
+
+# Upper bound for the `limit` query parameter of paginated lists
+
+MAX_PAGE_SIZE = 500
+
+# Slow query capture: statements of sampled requests running at least the threshold are recorded
+# for `python manage.py explain_queries`; a sample rate of 0 disables the capture
+
+SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', 100))
+SLOW_QUERY_SAMPLE_RATE = float(os.environ.get('SLOW_QUERY_SAMPLE_RATE', 0.1))
+
+# Restrict trade_network views to the supply chain assigned to the user (User.chain)
+
+TRADE_NETWORK_CHAIN_SCOPING = os.environ.get('TRADE_NETWORK_CHAIN_SCOPING', 'False') == 'True'
+
+# In-process LRU cache resolving trading network members by name in serializers;
+# the TTL in seconds bounds staleness after changes made by other processes
+
+NODE_LOOKUP_CACHE_SIZE = int(os.environ.get('NODE_LOOKUP_CACHE_SIZE', 10000))
+NODE_LOOKUP_CACHE_TTL = float(os.environ.get('NODE_LOOKUP_CACHE_TTL', 60))
+
+# Cache used by throttling and node cache invalidation; the default LocMemCache is per process,
+# so limits are shared between processes only with a shared backend such as Redis or Memcached
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    }
 }
 
 # Internationalization
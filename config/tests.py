@@ -0,0 +1,141 @@
+import datetime
+import json
+import os
+import re
+import tempfile
+from decimal import Decimal
+from io import BytesIO, StringIO
+
+import msgpack
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.exceptions import ParseError
+from rest_framework.test import APIClient
+
+from config.parsers import MessagePackParser
+from config.renderers import MessagePackRenderer
+from config.schema import SCHEMA_MEDIA_TYPE, load_schema
+from trade_network.models import Node
+from users.models import User
+
+
+class SchemaTestCase(TestCase):
+    """
+    Класс SchemaTestCase наследуется от класса TestCase из модуля django.test.
+    Проверяет генерацию файла OpenAPI схемы командой build_schema и ее выдачу по адресу '/schema'
+    с ответом 304 на условный запрос.
+    """
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path: str = os.path.join(directory.name, "openapi.json")
+        settings_override = override_settings(OPENAPI_SCHEMA_PATH=self.path)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        load_schema.cache_clear()
+        self.addCleanup(load_schema.cache_clear)
+
+    def test_build_schema_writes_artifact(self) -> None:
+        out = StringIO()
+        call_command("build_schema", output=self.path, stdout=out)
+        self.assertIn(f"Schema written to {self.path}", out.getvalue())
+        with open(self.path, "rb") as file:
+            schema = json.load(file)
+        self.assertEqual(schema["info"]["title"], "Trade network API")
+        operation = schema["paths"]["/trade_network/node/list"]["get"]
+        parameters = {parameter["name"] for parameter in operation["parameters"]}
+        self.assertTrue({"limit", "offset", "id__in"} <= parameters)
+        self.assertFalse([name for name in os.listdir(os.path.dirname(self.path)) if name.endswith(".tmp")])
+
+    def test_schema_served_from_artifact(self) -> None:
+        with open(self.path, "wb") as file:
+            file.write(b'{"openapi": "3.0.2"}')
+        response = self.client.get("/schema")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], SCHEMA_MEDIA_TYPE)
+        self.assertEqual(response.content, b'{"openapi": "3.0.2"}')
+        self.assertIn("max-age=", response["Cache-Control"])
+
+    def test_schema_not_modified(self) -> None:
+        """
+        Без файла схема генерируется при первом запросе и записывается в файл; повторный запрос
+        с полученным ETag получает ответ 304 без тела.
+        """
+        response = self.client.get("/schema")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(os.path.exists(self.path))
+        etag: str = response["ETag"]
+
+        response = self.client.get("/schema", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertFalse(response.content)
+        self.assertEqual(self.client.get("/schema", HTTP_IF_NONE_MATCH='"other"').status_code, 200)
+
+
+class MessagePackTestCase(TestCase):
+    """
+    Класс MessagePackTestCase наследуется от класса TestCase из модуля django.test.
+    Проверяет упаковку и распаковку данных в формате MessagePack, выбор формата при согласовании содержимого
+    и неизменность ответов в формате JSON.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create_user(username="member", password="secret")
+        cls.node = Node.objects.create(name="Factory", level=0, debt_to_the_supplier=Decimal("12.50"))
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def round_trip(self, data):
+        return MessagePackParser().parse(BytesIO(MessagePackRenderer().render(data)))
+
+    def test_decimal_round_trip(self) -> None:
+        self.assertEqual(self.round_trip({"debt": Decimal("12.50")}), {"debt": "12.50"})
+
+    def test_datetime_round_trip(self) -> None:
+        """
+        Дата и время передаются расширением Timestamp с точностью до микросекунды, в том числе до 1970 года;
+        время без часового пояса считается временем UTC.
+        """
+        moments = [
+            datetime.datetime(2024, 5, 17, 10, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            datetime.datetime(1969, 12, 31, 23, 59, 59, 999999, tzinfo=datetime.timezone.utc),
+        ]
+        for moment in moments:
+            self.assertEqual(self.round_trip({"at": moment}), {"at": moment})
+        naive = datetime.datetime(2024, 5, 17, 10, 30)
+        self.assertEqual(self.round_trip(naive), naive.replace(tzinfo=datetime.timezone.utc))
+        packed = msgpack.unpackb(MessagePackRenderer().render(moments[0]))
+        self.assertIsInstance(packed, msgpack.Timestamp)
+
+    def test_parse_error(self) -> None:
+        with self.assertRaises(ParseError):
+            MessagePackParser().parse(BytesIO(b"\xc1"))
+
+    def test_msgpack_negotiation(self) -> None:
+        response = self.client.get(f"/trade_network/node/{self.node.pk}", HTTP_ACCEPT="application/msgpack")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        node = msgpack.unpackb(response.content, timestamp=3)
+        self.assertEqual((node["name"], node["debt_to_the_supplier"]), ("Factory", "12.50"))
+        self.assertEqual(node["date_of_creation"], self.node.date_of_creation)
+
+        response = self.client.get("/trade_network/node/list?format=msgpack")
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        self.assertEqual(msgpack.unpackb(response.content)["results"][0]["name"], "Factory")
+
+    def test_json_unchanged(self) -> None:
+        """
+        С DATETIME_FORMAT = None ответы в формате JSON по-прежнему содержат дату и время в ISO 8601 с суффиксом Z.
+        """
+        response = self.client.get(f"/trade_network/node/{self.node.pk}", HTTP_ACCEPT="application/json")
+        self.assertEqual(response["Content-Type"], "application/json")
+        node = response.json()
+        self.assertEqual((node["name"], node["debt_to_the_supplier"]), ("Factory", "12.50"))
+        self.assertRegex(node["date_of_creation"], re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d+)?Z$"))
@@ -0,0 +1,87 @@
+import time
+from typing import Optional, Tuple
+
+from rest_framework.throttling import ScopedRateThrottle
+
+
+class TokenBucketThrottle(ScopedRateThrottle):
+    """
+    Класс TokenBucketThrottle наследуется от класса ScopedRateThrottle из модуля rest_framework.throttling.
+    Ограничивает частоту запросов по алгоритму "token bucket": для каждой пары (группа представлений, пользователь)
+    в кэше хранится только остаток токенов и время последнего обращения, а не история всех запросов.
+    Частота из DEFAULT_THROTTLE_RATES вида "N/период" задает емкость корзины N и скорость ее пополнения N за период.
+    Группа определяется атрибутом throttle_scope представления, стоимость запроса - атрибутом throttle_cost
+    или методом get_throttle_cost(request) представления. Чтение и запись корзины выполняются под блокировкой,
+    захватываемой атомарной операцией cache.add, поэтому одновременные запросы не списывают токены повторно.
+    Лимит общий для всех процессов только при общем кэше (Redis, Memcached, база данных); с кэшем по умолчанию
+    LocMemCache у каждого процесса своя корзина.
+    """
+    cache_format: str = 'throttle_bucket_%(scope)s_%(ident)s'
+    lock_timeout: int = 1
+    lock_attempts: int = 20
+    lock_delay: float = 0.005
+
+    def allow_request(self, request, view) -> bool:
+        """
+        Функция allow_request переопределяет метод базового класса. Пополняет корзину токенов пропорционально
+        времени, прошедшему с последнего запроса, и списывает стоимость текущего запроса. Возвращает False,
+        если токенов недостаточно.
+        """
+        self.scope: Optional[str] = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        if self.rate is None:
+            return True
+
+        self.key: str = self.get_cache_key(request, view)
+        self.cost: int = min(self.get_cost(request, view), self.num_requests)
+        self.tokens: float = 0.0
+        lock_key: str = f'{self.key}_lock'
+        if not self.acquire(lock_key):
+            return False
+
+        try:
+            self.now: float = self.timer()
+            bucket: Tuple[float, float] = self.cache.get(self.key, (self.num_requests, self.now))
+            tokens, updated = bucket
+            self.tokens = min(self.num_requests, tokens + (self.now - updated) * self.num_requests / self.duration)
+            if self.tokens < self.cost:
+                return False
+
+            self.cache.set(self.key, (self.tokens - self.cost, self.now), self.duration)
+            return True
+        finally:
+            self.cache.delete(lock_key)
+
+    def acquire(self, lock_key: str) -> bool:
+        """
+        Функция acquire захватывает блокировку корзины: cache.add записывает ключ, только если его еще нет,
+        атомарно во всех бэкендах кэша Django. Блокировка снимается сама через lock_timeout секунд, если процесс
+        завершился, не освободив ее. Если за lock_attempts попыток блокировку захватить не удалось, клиент
+        отправляет одновременно много запросов, и запрос отклоняется как при пустой корзине.
+        """
+        for _ in range(self.lock_attempts):
+            if self.cache.add(lock_key, 1, self.lock_timeout):
+                return True
+            time.sleep(self.lock_delay)
+        return False
+
+    def get_cost(self, request, view) -> int:
+        """
+        Функция get_cost возвращает количество токенов, списываемых за запрос. Дорогие представления
+        могут переопределить стоимость методом get_throttle_cost(request) или атрибутом throttle_cost.
+        """
+        get_throttle_cost = getattr(view, 'get_throttle_cost', None)
+        if get_throttle_cost is not None:
+            return max(1, int(get_throttle_cost(request)))
+        return getattr(view, 'throttle_cost', 1)
+
+    def wait(self) -> float:
+        """
+        Функция wait переопределяет метод базового класса. Возвращает количество секунд до накопления
+        в корзине токенов, достаточных для повторения запроса.
+        """
+        return (self.cost - self.tokens) * self.duration / self.num_requests
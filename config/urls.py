@@ -17,8 +17,14 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from config.schema import SchemaView
+
+admin.autodiscover()
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('users/', include('users.urls')),
     path("trade_network/", include("trade_network.urls")),
+    path("jobs/", include("jobs.urls")),
+    path("schema", SchemaView.as_view()),
 ]
@@ -0,0 +1,25 @@
+from typing import Tuple
+
+from django.contrib import admin
+
+from diagnostics.models import QueryShape
+
+
+class QueryShapeAdmin(admin.ModelAdmin):
+    """
+    Класс QueryShapeAdmin наследуется от класса ModelAdmin. Определяет вывод статистики медленных запросов
+    на панель администрирования. Статистика доступна только для просмотра и удаления.
+    """
+    list_display: Tuple[str, ...] = ("call_site", "calls", "total_ms", "max_ms", "last_seen")
+    search_fields: Tuple[str, ...] = ("call_site", "normalized_sql")
+    readonly_fields: Tuple[str, ...] = ("fingerprint", "call_site", "normalized_sql", "sample_sql", "sample_params",
+                                        "calls", "total_ms", "max_ms", "first_seen", "last_seen")
+
+    def has_add_permission(self, request) -> bool:
+        """
+        Функция has_add_permission запрещает создание записей из панели администратора.
+        """
+        return False
+
+
+admin.site.register(QueryShape, QueryShapeAdmin)
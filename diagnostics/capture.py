@@ -0,0 +1,103 @@
+import hashlib
+import logging
+import re
+import sys
+import time
+from typing import Any, List, Optional, Tuple
+
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from rest_framework.serializers import BaseSerializer
+
+from diagnostics.models import QueryShape
+
+logger = logging.getLogger(__name__)
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+PLACEHOLDER = re.compile(r"%s")
+VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    The normalize_sql function is a utility function. It replaces literals and parameter placeholders
+    with "?", collapses lists of values such as "IN (%s, %s, %s)" into "(?)" and whitespace into single spaces,
+    so statements that differ only in values get the same normalized form.
+    """
+    sql = STRING_LITERAL.sub("?", sql)
+    sql = NUMBER_LITERAL.sub("?", sql)
+    sql = PLACEHOLDER.sub("?", sql)
+    sql = VALUE_LIST.sub("(?)", sql)
+    return " ".join(sql.split())
+
+
+def serializer_on_stack() -> Optional[str]:
+    """
+    The serializer_on_stack function is a utility function. It walks the call stack and returns the class name
+    of the innermost serializer whose method executes the query, or None if the query is not made by a serializer.
+    """
+    frame = sys._getframe(2)
+    while frame is not None:
+        # type() rather than isinstance(): isinstance() would evaluate lazy objects such as request.user
+        # and run their queries from inside the wrapper
+        instance_type = type(frame.f_locals.get("self"))
+        if issubclass(instance_type, BaseSerializer):
+            return instance_type.__name__
+        frame = frame.f_back
+    return None
+
+
+class QueryCapture:
+    """
+    Класс QueryCapture - обертка выполнения SQL-запросов для connection.execute_wrapper.
+    Измеряет время выполнения каждого запроса и запоминает запросы не быстрее порога вместе с местом вызова.
+    Запросы сохраняются в базу данных методом flush после обработки HTTP-запроса, чтобы запись результатов
+    не попадала в измерения.
+    """
+
+    def __init__(self, view: str, threshold_ms: float) -> None:
+        self.view: str = view
+        self.threshold_ms: float = threshold_ms
+        self.captured: List[Tuple[str, Any, float, str]] = []
+
+    def __call__(self, execute, sql: str, params: Any, many: bool, context: dict) -> Any:
+        """
+        Функция __call__ выполняет запрос и, если он выполнялся дольше порога, запоминает его текст,
+        параметры, время выполнения и место вызова.
+        """
+        started: float = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed_ms: float = (time.perf_counter() - started) * 1000
+            if elapsed_ms >= self.threshold_ms:
+                serializer: Optional[str] = serializer_on_stack()
+                call_site: str = f"{self.view} / {serializer}" if serializer else self.view
+                self.captured.append((sql, None if many else params, elapsed_ms, call_site))
+
+    def flush(self) -> None:
+        """
+        Функция flush добавляет запомненные запросы к статистике их нормализованных форм. Ошибки записи
+        статистики заносятся в журнал и не влияют на ответ.
+        """
+        for sql, params, elapsed_ms, call_site in self.captured:
+            normalized: str = normalize_sql(sql)
+            try:
+                shape, _ = QueryShape.objects.get_or_create(
+                    fingerprint=hashlib.md5(normalized.encode()).hexdigest(),
+                    call_site=call_site[:300],
+                    defaults={"normalized_sql": normalized, "sample_sql": sql},
+                )
+                QueryShape.objects.filter(pk=shape.pk).update(
+                    calls=F("calls") + 1,
+                    total_ms=F("total_ms") + elapsed_ms,
+                    max_ms=Greatest(F("max_ms"), Value(elapsed_ms, output_field=FloatField())),
+                    sample_sql=sql,
+                    sample_params=list(params or []),
+                    last_seen=timezone.now(),
+                )
+            except Exception:
+                logger.exception("Failed to record a slow query")
+        self.captured = []
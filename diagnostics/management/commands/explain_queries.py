@@ -0,0 +1,88 @@
+from typing import List, Tuple
+
+from django.db import DatabaseError, connection, transaction
+from django.core.management.base import BaseCommand
+
+from diagnostics.models import QueryShape
+
+
+class Rollback(Exception):
+    """
+    Класс Rollback - исключение для отката транзакции после выполнения EXPLAIN ANALYZE.
+    """
+
+
+class Command(BaseCommand):
+    """
+    Класс Command наследуется от класса BaseCommand из модуля django.core.management.base.
+    Выводит отчет о самых дорогих формах медленных запросов, упорядоченных по суммарному времени,
+    с планом выполнения последнего примера каждого запроса.
+    """
+    help: str = 'Rank captured slow query shapes and show their execution plans'
+
+    def add_arguments(self, parser) -> None:
+        """
+        Функция add_arguments определяет параметры команды: количество форм запросов в отчете, фильтр
+        по месту вызова, выполнение запросов для EXPLAIN ANALYZE и очистку собранной статистики.
+        """
+        parser.add_argument('--top', type=int, default=10)
+        parser.add_argument('--call-site', help='Only shapes whose call site contains this text')
+        parser.add_argument('--analyze', action='store_true',
+                            help='Run SELECT statements with EXPLAIN ANALYZE inside a rolled back transaction')
+        parser.add_argument('--no-plan', action='store_true', help='Only print the ranking')
+        parser.add_argument('--clear', action='store_true', help='Delete the captured statistics and exit')
+
+    def handle(self, *args, **options) -> None:
+        """
+        Функция handle выводит для каждой формы запроса место вызова, количество вызовов, суммарное, среднее
+        и максимальное время, нормализованный текст и план выполнения.
+        """
+        if options['clear']:
+            deleted, _ = QueryShape.objects.all().delete()
+            self.stdout.write(f'{deleted} query shapes deleted')
+            return
+
+        shapes = QueryShape.objects.order_by('-total_ms')
+        if options['call_site']:
+            shapes = shapes.filter(call_site__icontains=options['call_site'])
+
+        for rank, shape in enumerate(shapes[:options['top']], start=1):
+            self.stdout.write(
+                f'#{rank} total {shape.total_ms:.1f} ms, {shape.calls} calls, '
+                f'avg {shape.total_ms / max(shape.calls, 1):.1f} ms, max {shape.max_ms:.1f} ms'
+            )
+            self.stdout.write(f'   {shape.call_site}')
+            self.stdout.write(f'   {shape.normalized_sql}')
+            if not options['no_plan']:
+                for line in explain(shape.sample_sql, shape.sample_params, options['analyze']):
+                    self.stdout.write(f'      {line}')
+            self.stdout.write('')
+
+
+def explain(sql: str, params: list, analyze: bool) -> List[str]:
+    """
+    The explain function is a utility function. It returns the execution plan of the statement as lines of text
+    using the syntax of the database backend. With analyze=True, SELECT statements on PostgreSQL are executed
+    with EXPLAIN (ANALYZE, BUFFERS) inside a transaction that is always rolled back.
+    """
+    vendor: str = connection.vendor
+    if vendor == 'postgresql':
+        run: bool = analyze and sql.lstrip().upper().startswith('SELECT')
+        prefix: str = 'EXPLAIN (ANALYZE, BUFFERS) ' if run else 'EXPLAIN '
+    elif vendor == 'sqlite':
+        prefix = 'EXPLAIN QUERY PLAN '
+    else:
+        prefix = 'EXPLAIN '
+
+    rows: List[Tuple] = []
+    try:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(prefix + sql, params or None)
+                rows = cursor.fetchall()
+            raise Rollback
+    except Rollback:
+        pass
+    except DatabaseError as exc:
+        return [f'EXPLAIN failed: {exc}']
+    return [' '.join(str(value) for value in row) for row in rows]
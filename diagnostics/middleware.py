@@ -0,0 +1,52 @@
+import random
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from diagnostics.capture import QueryCapture
+
+
+class SlowQueryMiddleware:
+    """
+    Класс SlowQueryMiddleware - промежуточный слой Django. Для доли запросов SLOW_QUERY_SAMPLE_RATE
+    измеряет время выполнения всех SQL-запросов представления и сохраняет запросы, выполнявшиеся
+    не быстрее SLOW_QUERY_THRESHOLD_MS миллисекунд. Отключается нулевой долей запросов.
+    """
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        self.threshold_ms: float = settings.SLOW_QUERY_THRESHOLD_MS
+        self.sample_rate: float = settings.SLOW_QUERY_SAMPLE_RATE
+
+    def __call__(self, request):
+        """
+        Функция __call__ обрабатывает запрос с оберткой выполнения SQL-запросов для всех подключений
+        к базам данных и после получения ответа сохраняет найденные медленные запросы.
+        """
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        capture = QueryCapture(view=request.path, threshold_ms=self.threshold_ms)
+        request.query_capture = capture
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(capture))
+            response = self.get_response(request)
+
+        capture.flush()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs) -> None:
+        """
+        Функция process_view заменяет адрес запроса в месте вызова на полное имя класса или функции представления,
+        а для представлений из пространств имен URL (например, панели администратора) - на имя маршрута.
+        """
+        capture = getattr(request, "query_capture", None)
+        if capture is None:
+            return
+        if request.resolver_match.namespace:
+            capture.view = request.resolver_match.view_name
+        else:
+            view = getattr(view_func, "view_class", view_func)
+            capture.view = f"{view.__module__}.{view.__qualname__}"
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.3 on 2026-10-19 06:23
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueryShape',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(max_length=32)),
+                ('call_site', models.CharField(max_length=300)),
+                ('normalized_sql', models.TextField()),
+                ('sample_sql', models.TextField()),
+                ('sample_params', models.JSONField(default=list, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('calls', models.PositiveIntegerField(default=0)),
+                ('total_ms', models.FloatField(default=0)),
+                ('max_ms', models.FloatField(default=0)),
+                ('first_seen', models.DateTimeField(auto_now_add=True)),
+                ('last_seen', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'slow query shape',
+                'verbose_name_plural': 'slow query shapes',
+                'ordering': ['-total_ms'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='queryshape',
+            constraint=models.UniqueConstraint(fields=('fingerprint', 'call_site'), name='unique_query_shape_call_site'),
+        ),
+    ]
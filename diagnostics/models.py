@@ -0,0 +1,41 @@
+from typing import List
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class QueryShape(models.Model):
+    """
+    Класс QueryShape наследуется от базового класса Model из модуля django.db.models.
+    Определяет поля таблицы медленных SQL-запросов, сгруппированных по нормализованному тексту запроса
+    и месту вызова (представление и сериализатор). Хранит последний пример запроса с параметрами для EXPLAIN.
+    """
+    fingerprint = models.CharField(max_length=32)
+    call_site = models.CharField(max_length=300)
+    normalized_sql = models.TextField()
+    sample_sql = models.TextField()
+    sample_params = models.JSONField(encoder=DjangoJSONEncoder, default=list)
+    calls = models.PositiveIntegerField(default=0)
+    total_ms = models.FloatField(default=0)
+    max_ms = models.FloatField(default=0)
+    first_seen = models.DateTimeField(auto_now_add=True)
+    last_seen = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        """
+        Функция __str__ переопределяет метод родительского класса Model и создает
+        выходной формат для экземпляров этого класса.
+        """
+        return f'{self.call_site}: {self.normalized_sql[:80]}'
+
+    class Meta:
+        """
+        Метакласс содержит общее имя экземпляра модели в единственном и множественном числе, используемое
+        в панели администрирования.
+        """
+        verbose_name: str = 'slow query shape'
+        verbose_name_plural: str = 'slow query shapes'
+        ordering: List[str] = ['-total_ms']
+        constraints: List[models.BaseConstraint] = [
+            models.UniqueConstraint(fields=['fingerprint', 'call_site'], name='unique_query_shape_call_site'),
+        ]
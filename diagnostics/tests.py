@@ -0,0 +1,127 @@
+from io import StringIO
+from typing import List
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from rest_framework import serializers
+
+from diagnostics.capture import QueryCapture, normalize_sql
+from diagnostics.management.commands.explain_queries import explain
+from diagnostics.models import QueryShape
+from trade_network.models import Node
+
+
+class MemberSerializer(serializers.Serializer):
+    """
+    Класс MemberSerializer наследуется от класса Serializer из rest_framework.serializers.
+    Сериализатор, выполняющий запрос в своем методе, для проверки определения места вызова.
+    """
+
+    def load(self) -> List[Node]:
+        return list(Node.objects.all())
+
+
+class NormalizeSqlTestCase(TestCase):
+    """
+    Класс NormalizeSqlTestCase наследуется от класса TestCase из модуля django.test.
+    Проверяет замену литералов и списков значений при нормализации текста запроса.
+    """
+
+    def test_literals(self) -> None:
+        self.assertEqual(
+            normalize_sql("SELECT * FROM t WHERE name = 'O''Brien' AND price > 10.5 AND id = %s"),
+            "SELECT * FROM t WHERE name = ? AND price > ? AND id = ?",
+        )
+
+    def test_value_lists(self) -> None:
+        self.assertEqual(normalize_sql('SELECT "t"."id" FROM t WHERE id IN (%s, %s,%s)'),
+                         'SELECT "t"."id" FROM t WHERE id IN (?)')
+        self.assertEqual(normalize_sql("SELECT 1 FROM t WHERE id IN (1, 2)"),
+                         normalize_sql("SELECT 1 FROM t WHERE id IN (3, 4, 5, 6)"))
+
+    def test_whitespace_and_identifiers(self) -> None:
+        self.assertEqual(normalize_sql("SELECT  t1.col2\n  FROM   t1"), "SELECT t1.col2 FROM t1")
+
+
+class QueryCaptureTestCase(TestCase):
+    """
+    Класс QueryCaptureTestCase наследуется от класса TestCase из модуля django.test.
+    Проверяет отбор запросов по порогу времени, определение места вызова и сохранение статистики.
+    """
+
+    @staticmethod
+    def execute(sql, params, many, context) -> None:
+        return None
+
+    def test_threshold(self) -> None:
+        capture = QueryCapture(view="view", threshold_ms=50)
+        with mock.patch("diagnostics.capture.time.perf_counter", side_effect=[0, 0.049, 0, 0.05, 0, 0.2]):
+            capture(self.execute, "SELECT %s", [1], False, {})
+            capture(self.execute, "SELECT %s", [2], False, {})
+            capture(self.execute, "INSERT %s", [[3], [4]], True, {})
+        self.assertEqual([(sql, params, round(ms)) for sql, params, ms, _ in capture.captured],
+                         [("SELECT %s", [2], 50), ("INSERT %s", None, 200)])
+
+    def test_call_site(self) -> None:
+        capture = QueryCapture(view="view", threshold_ms=0)
+        with connection.execute_wrapper(capture):
+            MemberSerializer().load()
+            Node.objects.count()
+        self.assertEqual([call_site for *_, call_site in capture.captured], ["view / MemberSerializer", "view"])
+
+    def test_flush_merges_shapes(self) -> None:
+        capture = QueryCapture(view="view", threshold_ms=0)
+        capture.captured = [
+            ("SELECT * FROM t WHERE id IN (%s, %s)", [1, 2], 10.0, "view"),
+            ("SELECT * FROM t WHERE id IN (%s)", [3], 30.0, "view"),
+            ("SELECT * FROM t WHERE id IN (%s)", [4], 5.0, "view / MemberSerializer"),
+        ]
+        capture.flush()
+        self.assertEqual(capture.captured, [])
+        shape: QueryShape = QueryShape.objects.get(call_site="view")
+        self.assertEqual((shape.calls, shape.total_ms, shape.max_ms), (2, 40.0, 30.0))
+        self.assertEqual(shape.normalized_sql, "SELECT * FROM t WHERE id IN (?)")
+        self.assertEqual((shape.sample_sql, shape.sample_params), ("SELECT * FROM t WHERE id IN (%s)", [3]))
+        self.assertEqual(QueryShape.objects.get(call_site="view / MemberSerializer").calls, 1)
+
+
+class ExplainQueriesTestCase(TestCase):
+    """
+    Класс ExplainQueriesTestCase наследуется от класса TestCase из модуля django.test.
+    Проверяет, что команда explain_queries выполняет с EXPLAIN ANALYZE только запросы SELECT,
+    а изменяющие данные запросы лишь объясняет.
+    """
+
+    def explained(self, sql: str) -> str:
+        """
+        Функция explained возвращает текст, переданный базе данных PostgreSQL при объяснении запроса
+        с параметром analyze.
+        """
+        cursor = mock.MagicMock()
+        cursor.fetchall.return_value = [("Seq Scan",)]
+        with mock.patch("diagnostics.management.commands.explain_queries.connection") as fake:
+            fake.vendor = "postgresql"
+            fake.cursor.return_value.__enter__.return_value = cursor
+            self.assertEqual(explain(sql, [], analyze=True), ["Seq Scan"])
+        return cursor.execute.call_args.args[0]
+
+    def test_analyze_select(self) -> None:
+        self.assertEqual(self.explained("SELECT 1"), "EXPLAIN (ANALYZE, BUFFERS) SELECT 1")
+
+    def test_analyze_refuses_non_select(self) -> None:
+        self.assertEqual(self.explained("UPDATE t SET a = 1"), "EXPLAIN UPDATE t SET a = 1")
+        self.assertEqual(self.explained("DELETE FROM t"), "EXPLAIN DELETE FROM t")
+
+    def test_command_keeps_data(self) -> None:
+        node: Node = Node.objects.create(name="Factory", level=0)
+        QueryShape.objects.create(
+            fingerprint="f", call_site="view", normalized_sql="DELETE FROM trade_network_node",
+            sample_sql="DELETE FROM trade_network_node WHERE id = %s", sample_params=[node.pk], calls=1, total_ms=5,
+            max_ms=5,
+        )
+        out = StringIO()
+        call_command("explain_queries", analyze=True, stdout=out)
+        self.assertIn("#1 total 5.0 ms, 1 calls", out.getvalue())
+        self.assertTrue(Node.objects.filter(pk=node.pk).exists())
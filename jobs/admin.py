@@ -0,0 +1,26 @@
+from typing import Tuple
+
+from django.contrib import admin
+
+from jobs.models import Job
+
+
+class JobAdmin(admin.ModelAdmin):
+    """
+    Класс JobAdmin наследуется от класса ModelAdmin. Определяет вывод полей фоновых задач
+    на панель администрирования. Задачи доступны только для просмотра.
+    """
+    list_display: Tuple[str, ...] = ("id", "name", "status", "progress", "total", "user", "created_at", "finished_at")
+    list_filter: Tuple[str, ...] = ("status", "name")
+    readonly_fields: Tuple[str, ...] = ("name", "kwargs", "status", "progress", "total", "result", "error", "user",
+                                        "created_at", "started_at", "finished_at")
+
+    def has_add_permission(self, request) -> bool:
+        """
+        Функция has_add_permission запрещает создание задач из панели администратора,
+        задачи ставятся в очередь только кодом приложения.
+        """
+        return False
+
+
+admin.site.register(Job, JobAdmin)
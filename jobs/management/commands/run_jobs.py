@@ -0,0 +1,94 @@
+import multiprocessing
+import os
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List
+
+from django.core.management.base import BaseCommand
+
+from jobs.models import Job
+from jobs.registry import claim, fail
+from jobs.worker import execute, setup_worker
+
+
+class Command(BaseCommand):
+    """
+    Класс Command наследуется от класса BaseCommand из модуля django.core.management.base.
+    Обработчик очереди фоновых задач: опрашивает таблицу Job, захватывает ожидающие задачи
+    и выполняет их в пуле процессов. Для работы нужна только база данных проекта.
+    """
+    help: str = 'Run the background job worker'
+    requires_system_checks: list = []
+
+    def add_arguments(self, parser) -> None:
+        """
+        Функция add_arguments определяет параметры команды: количество процессов, интервал опроса очереди
+        и режим завершения после выполнения всех ожидающих задач.
+        """
+        parser.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--poll-interval', type=float, default=1.0)
+        parser.add_argument('--once', action='store_true', help='Exit when the queue is empty')
+        parser.add_argument('--requeue-running', action='store_true',
+                            help='Return jobs left running by a stopped worker to the queue; use with a single worker')
+
+    def handle(self, *args, **options) -> None:
+        """
+        Функция handle запускает пул процессов и цикл опроса очереди. Задачи захватываются в порядке
+        создания не больше, чем есть свободных процессов. Если процесс пула аварийно завершился,
+        пул создается заново.
+        """
+        processes: int = options['processes']
+
+        if options['requeue_running']:
+            requeued: int = Job.objects.filter(status=Job.RUNNING).update(status=Job.PENDING, started_at=None)
+            self.stdout.write(f'{requeued} running jobs returned to the queue')
+
+        while True:
+            with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=setup_worker,
+                                     initargs=(os.environ['DJANGO_SETTINGS_MODULE'],)) as pool:
+                self.stdout.write(f'Job worker started with {processes} processes')
+                if not self.serve(pool, processes, options):
+                    return
+            self.stderr.write('A worker process died, restarting the process pool')
+
+    def serve(self, pool: ProcessPoolExecutor, processes: int, options: Dict[str, Any]) -> bool:
+        """
+        Функция serve выполняет цикл опроса очереди в пуле процессов. Исключение, полученное из процесса
+        при выполнении задачи, выводится, а задача помечается завершившейся с ошибкой, не прерывая обработку
+        остальных задач. Возвращает True, если пул процессов стал непригоден (процесс аварийно завершился)
+        и должен быть создан заново, и False при завершении с параметром --once.
+        """
+        running: Dict[Future, int] = {}
+        while True:
+            free: int = processes - len(running)
+            if free:
+                pending: List[int] = list(
+                    Job.objects.filter(status=Job.PENDING).order_by('id').values_list('id', flat=True)[:free]
+                )
+                for job_id in pending:
+                    if claim(job_id):
+                        running[pool.submit(execute, job_id)] = job_id
+
+            if not running:
+                if options['once']:
+                    return False
+                time.sleep(options['poll_interval'])
+                continue
+
+            done, _ = wait(running, timeout=options['poll_interval'], return_when=FIRST_COMPLETED)
+            broken: bool = False
+            for future in done:
+                job_id: int = running.pop(future)
+                try:
+                    self.stdout.write(f'Job #{job_id} {future.result()}')
+                except Exception as error:
+                    broken = broken or isinstance(error, BrokenProcessPool)
+                    fail(job_id, ''.join(traceback.format_exception(error)))
+                    self.stderr.write(f'Job #{job_id} {Job.FAILED}: {error!r}')
+            if broken:
+                for job_id in running.values():
+                    fail(job_id, 'The worker process pool was terminated abruptly')
+                return True
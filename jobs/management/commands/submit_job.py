@@ -0,0 +1,35 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.registry import get_tasks, submit
+
+
+class Command(BaseCommand):
+    """
+    Класс Command наследуется от класса BaseCommand из модуля django.core.management.base.
+    Ставит зарегистрированную фоновую задачу в очередь. Аргументы задачи передаются объектом JSON.
+    """
+    help: str = 'Submit a registered background task to the job queue'
+    requires_system_checks: list = []
+
+    def add_arguments(self, parser) -> None:
+        """
+        Функция add_arguments определяет параметры команды: имя задачи и ее аргументы в формате JSON.
+        """
+        parser.add_argument('name', help='One of the registered tasks')
+        parser.add_argument('--kwargs', default='{}', help='Task keyword arguments as a JSON object')
+
+    def handle(self, *args, **options) -> None:
+        """
+        Функция handle проверяет имя задачи и аргументы и создает задачу в очереди.
+        """
+        if options['name'] not in get_tasks():
+            raise CommandError(f"Unknown task '{options['name']}', available: {', '.join(sorted(get_tasks()))}")
+        try:
+            kwargs: dict = json.loads(options['kwargs'])
+        except json.JSONDecodeError as exc:
+            raise CommandError(f'Invalid --kwargs: {exc}')
+
+        job = submit(options['name'], **kwargs)
+        self.stdout.write(f'Job #{job.pk} queued')
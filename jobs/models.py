@@ -0,0 +1,56 @@
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import models
+
+
+class Job(models.Model):
+    """
+    Класс Job наследуется от базового класса Model из модуля django.db.models.
+    Определяет поля таблицы базы данных с очередью фоновых задач, их свойства и ограничения.
+    """
+    PENDING: str = 'pending'
+    RUNNING: str = 'running'
+    DONE: str = 'done'
+    FAILED: str = 'failed'
+    STATUSES: List[tuple] = [(PENDING, PENDING), (RUNNING, RUNNING), (DONE, DONE), (FAILED, FAILED)]
+
+    name = models.CharField(max_length=100)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUSES, default=PENDING, db_index=True)
+    progress = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        """
+        Функция __str__ переопределяет метод родительского класса Model и создает
+        выходной формат для экземпляров этого класса.
+        """
+        return f'{self.name} #{self.pk} ({self.status})'
+
+    class Meta:
+        """
+        Метакласс содержит общее имя экземпляра модели в единственном и множественном числе, используемое
+        в панели администрирования.
+        """
+        verbose_name: str = 'job'
+        verbose_name_plural: str = 'jobs'
+        ordering: List[str] = ['-created_at']
+
+    def set_progress(self, progress: int, total: Optional[int] = None) -> None:
+        """
+        Функция set_progress сохраняет количество обработанных элементов и, если передано, их общее количество.
+        Вызывается задачей во время выполнения, обновляет только поля прогресса.
+        """
+        values: Dict[str, Any] = {'progress': progress}
+        if total is not None:
+            values['total'] = total
+        Job.objects.filter(pk=self.pk).update(**values)
+        for field, value in values.items():
+            setattr(self, field, value)
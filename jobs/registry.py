@@ -0,0 +1,85 @@
+import traceback
+from typing import Any, Callable, Dict, Optional
+
+from django.db import close_old_connections
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from jobs.models import Job
+
+tasks: Dict[str, Callable[..., Any]] = {}
+_discovered: bool = False
+
+
+def get_tasks() -> Dict[str, Callable[..., Any]]:
+    """
+    The get_tasks function returns the registered tasks. On the first call it imports the tasks modules
+    of all installed applications; this is done lazily rather than at startup, so processes that never
+    submit or run jobs do not import the task code and its dependencies.
+    """
+    global _discovered
+    if not _discovered:
+        autodiscover_modules('tasks')
+        _discovered = True
+    return tasks
+
+
+def register(name: str) -> Callable:
+    """
+    The register function is a decorator. It registers the decorated function as a background task
+    under the given name. The task is called with the Job instance and the keyword arguments passed to submit,
+    and its return value must be JSON serializable.
+    """
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        tasks[name] = func
+        return func
+    return decorator
+
+
+def submit(name: str, user=None, **kwargs) -> Job:
+    """
+    The submit function is a utility function. It puts a registered task into the queue and returns
+    the created Job instance. The task is executed later by the run_jobs management command.
+    """
+    if name not in get_tasks():
+        raise KeyError(f"Unknown task '{name}'")
+    return Job.objects.create(name=name, kwargs=kwargs, user=user if user and user.is_authenticated else None)
+
+
+def claim(job_id: int) -> bool:
+    """
+    The claim function is a utility function. It atomically marks a pending job as running and returns
+    True if this process got the job. A single conditional UPDATE keeps several workers from taking the same job
+    on any database backend.
+    """
+    return bool(Job.objects.filter(pk=job_id, status=Job.PENDING).update(status=Job.RUNNING, started_at=timezone.now()))
+
+
+def run_job(job_id: int) -> Optional[str]:
+    """
+    The run_job function is a utility function. It executes a claimed job and stores its result or the traceback
+    of the raised exception, including a result that cannot be stored. Returns the final status of the job,
+    or None if the job no longer exists.
+    """
+    close_old_connections()
+    try:
+        job: Optional[Job] = Job.objects.filter(pk=job_id).first()
+        if job is None:
+            return None
+        result: Any = get_tasks()[job.name](job, **job.kwargs)
+        Job.objects.filter(pk=job_id).update(status=Job.DONE, result=result, finished_at=timezone.now())
+        return Job.DONE
+    except Exception:
+        fail(job_id, traceback.format_exc())
+        return Job.FAILED
+    finally:
+        close_old_connections()
+
+
+def fail(job_id: int, error: str) -> int:
+    """
+    The fail function is a utility function. It marks a running job as failed with the given error
+    and returns the number of updated jobs.
+    """
+    return Job.objects.filter(pk=job_id, status=Job.RUNNING).update(status=Job.FAILED, error=error,
+                                                                     finished_at=timezone.now())
@@ -0,0 +1,23 @@
+from typing import List, Tuple
+
+from django.db import models
+from rest_framework import serializers
+
+from jobs.models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    """
+    Класс JobSerializer наследуется от класса ModelSerializer из rest_framework.serializers.
+    Это класс для сериализации состояния фоновой задачи при опросе ее статуса.
+    """
+
+    class Meta:
+        """
+        Метакласс - это внутренний служебный класс сериализатора,
+        определяет необходимые параметры для функционирования сериализатора.
+        """
+        model: models.Model = Job
+        fields: List[str] = ["id", "name", "status", "progress", "total", "result", "error",
+                             "created_at", "started_at", "finished_at"]
+        read_only_fields: Tuple[str, ...] = tuple(fields)
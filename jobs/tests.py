@@ -0,0 +1,175 @@
+from decimal import Decimal
+from typing import Any, Dict
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from jobs import registry
+from jobs.models import Job
+from trade_network.models import Node
+from trade_network.tasks import clear_debt
+from users.models import User
+
+
+def add(job: Job, a: int, b: int) -> Dict[str, int]:
+    """
+    The add function is a background task used by the tests. It returns the sum of the arguments.
+    """
+    return {'sum': a + b}
+
+
+def explode(job: Job) -> None:
+    """
+    The explode function is a background task used by the tests. It always raises an exception.
+    """
+    raise ValueError("boom")
+
+
+@mock.patch("jobs.registry.close_old_connections")
+@mock.patch.dict(registry.tasks, {'tests.add': add, 'tests.explode': explode})
+class RegistryTestCase(TestCase):
+    """
+    Класс RegistryTestCase наследуется от класса TestCase из модуля django.test.
+    Проверяет постановку задач в очередь, захват задачи обработчиком, ее выполнение и завершение с ошибкой.
+    Закрытие соединений в run_job подменяется: внутри транзакции теста оно прервало бы транзакцию.
+    """
+
+    def test_submit_unknown_task(self, close_old_connections: mock.Mock) -> None:
+        with self.assertRaises(KeyError):
+            registry.submit('tests.missing')
+        self.assertFalse(Job.objects.exists())
+
+    def test_submit(self, close_old_connections: mock.Mock) -> None:
+        job: Job = registry.submit('tests.add', a=1, b=2)
+        self.assertEqual((job.status, job.kwargs, job.user), (Job.PENDING, {'a': 1, 'b': 2}, None))
+
+    def test_claim_refuses_running_job(self, close_old_connections: mock.Mock) -> None:
+        job: Job = registry.submit('tests.add', a=1, b=2)
+        self.assertTrue(registry.claim(job.pk))
+        self.assertFalse(registry.claim(job.pk))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.RUNNING)
+        self.assertIsNotNone(job.started_at)
+
+    def test_run_job_stores_result(self, close_old_connections: mock.Mock) -> None:
+        job: Job = registry.submit('tests.add', a=1, b=2)
+        registry.claim(job.pk)
+        self.assertEqual(registry.run_job(job.pk), Job.DONE)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result, job.error), (Job.DONE, {'sum': 3}, ''))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_run_job_stores_traceback(self, close_old_connections: mock.Mock) -> None:
+        job: Job = registry.submit('tests.explode')
+        registry.claim(job.pk)
+        self.assertEqual(registry.run_job(job.pk), Job.FAILED)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertIn("Traceback", job.error)
+        self.assertIn("ValueError: boom", job.error)
+        self.assertIsNone(job.result)
+
+    def test_run_missing_job(self, close_old_connections: mock.Mock) -> None:
+        self.assertIsNone(registry.run_job(0))
+
+    def test_fail_updates_only_running_job(self, close_old_connections: mock.Mock) -> None:
+        job: Job = registry.submit('tests.add', a=1, b=2)
+        self.assertEqual(registry.fail(job.pk, "stopped"), 0)
+        registry.claim(job.pk)
+        self.assertEqual(registry.fail(job.pk, "stopped"), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), (Job.FAILED, "stopped"))
+        self.assertIsNotNone(job.finished_at)
+
+
+class ClearDebtTestCase(TestCase):
+    """
+    Класс ClearDebtTestCase наследуется от класса TestCase из модуля django.test.
+    Проверяет обнуление задолженности по списку идентификаторов и по фильтрам со строкой поиска:
+    выборка обходится диапазонами идентификаторов, прогресс сохраняется после каждого диапазона.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.factory = Node.objects.create(name="Factory", level=0)
+        cls.shops = [Node.objects.create(name=f"Shop {number}", level=1, supplier=cls.factory,
+                                         debt_to_the_supplier=Decimal("10.00")) for number in range(5)]
+        cls.retail = Node.objects.create(name="Retail", level=1, supplier=cls.factory,
+                                         debt_to_the_supplier=Decimal("10.00"))
+        cls.inactive = Node.objects.create(name="Shop closed", level=1, supplier=cls.factory, is_active=False,
+                                           debt_to_the_supplier=Decimal("10.00"))
+
+    def setUp(self) -> None:
+        self.job: Job = Job.objects.create(name='trade_network.clear_debt')
+
+    def debts(self) -> Dict[str, Decimal]:
+        return dict(Node.objects.filter(level=1).values_list("name", "debt_to_the_supplier"))
+
+    def test_ids(self) -> None:
+        ids = [self.shops[0].pk, self.retail.pk]
+        with mock.patch("trade_network.tasks.BATCH_SIZE", 1):
+            self.assertEqual(clear_debt(self.job, ids=ids), {'updated': 2})
+        self.assertEqual((self.job.progress, self.job.total), (2, 2))
+        debts: Dict[str, Decimal] = self.debts()
+        self.assertEqual((debts["Shop 0"], debts["Retail"], debts["Shop 1"]), (0, 0, Decimal("10.00")))
+
+    def test_filters_and_search(self) -> None:
+        with mock.patch("trade_network.tasks.BATCH_SIZE", 2), \
+                mock.patch.object(Job, "set_progress", autospec=True, side_effect=Job.set_progress) as set_progress:
+            result: Any = clear_debt(self.job, filters={'is_active': True}, search="Shop")
+        self.assertEqual(result, {'updated': 5})
+        self.assertEqual([call.args[1:] for call in set_progress.call_args_list], [(0,), (2,), (4,), (5,)])
+        self.assertEqual(set_progress.call_args_list[0].kwargs, {'total': 5})
+        self.job.refresh_from_db()
+        self.assertEqual((self.job.progress, self.job.total), (5, 5))
+        debts: Dict[str, Decimal] = self.debts()
+        self.assertTrue(all(debts[shop.name] == 0 for shop in self.shops))
+        self.assertEqual((debts["Retail"], debts["Shop closed"]), (Decimal("10.00"), Decimal("10.00")))
+
+    def test_empty_selection(self) -> None:
+        self.assertEqual(clear_debt(self.job, filters={'name': "Nobody"}), {'updated': 0})
+        self.job.refresh_from_db()
+        self.assertEqual((self.job.progress, self.job.total), (0, 0))
+
+
+class JobViewTestCase(TestCase):
+    """
+    Класс JobViewTestCase наследуется от класса TestCase из модуля django.test.
+    Проверяет запрос статуса фоновой задачи: пользователь видит только свои задачи, сотрудник - все.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.owner = User.objects.create_user(username="owner", password="owner")
+        cls.other = User.objects.create_user(username="other", password="other")
+        cls.staff = User.objects.create_user(username="staff", password="staff", is_staff=True)
+        cls.job = Job.objects.create(name='trade_network.clear_debt', user=cls.owner, status=Job.RUNNING,
+                                     progress=3, total=10)
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+
+    def test_owner_sees_status(self) -> None:
+        self.client.force_authenticate(self.owner)
+        response = self.client.get(f"/jobs/{self.job.pk}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data["status"], response.data["progress"], response.data["total"]),
+                         (Job.RUNNING, 3, 10))
+
+    def test_other_user_gets_not_found(self) -> None:
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.get(f"/jobs/{self.job.pk}").status_code, 404)
+
+    def test_staff_sees_any_job(self) -> None:
+        self.client.force_authenticate(self.staff)
+        self.assertEqual(self.client.get(f"/jobs/{self.job.pk}").status_code, 200)
+
+    def test_anonymous_is_rejected(self) -> None:
+        self.assertEqual(self.client.get(f"/jobs/{self.job.pk}").status_code, 401)
+
+    def test_invalid_pk_is_not_found(self) -> None:
+        self.client.force_authenticate(self.owner)
+        self.assertEqual(self.client.get("/jobs/abc").status_code, 404)
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from jobs import views
+
+urlpatterns = [
+    path("<int:pk>", views.JobView.as_view()),
+]
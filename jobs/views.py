@@ -0,0 +1,28 @@
+from django.db import models
+from django.db.models import QuerySet
+from rest_framework import permissions
+from rest_framework.generics import RetrieveAPIView
+
+from config.generics import LazySerializerMixin
+from jobs.models import Job
+
+
+class JobView(LazySerializerMixin, RetrieveAPIView):
+    """
+    Класс JobView наследуется от класса RetrieveAPIView из модуля rest_framework.generics
+    и представляет собой представление на основе класса для обработки запросов методом GET по адресу '/jobs/<pk>'.
+    Возвращает статус и прогресс фоновой задачи. Пользователь видит только свои задачи, персонал - все.
+    """
+    model: models.Model = Job
+    serializer_class: str = 'jobs.serializers.JobSerializer'
+    permission_classes: list = [permissions.IsAuthenticated, ]
+    throttle_scope: str = 'jobs'
+
+    def get_queryset(self) -> QuerySet:
+        """
+        Функция get_queryset переопределяет метод родительского класса. Ограничивает набор задач
+        задачами пользователя, сделавшего запрос, если он не является сотрудником.
+        """
+        if self.request.user.is_staff:
+            return Job.objects.all()
+        return Job.objects.filter(user=self.request.user)
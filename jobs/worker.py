@@ -0,0 +1,23 @@
+import os
+from typing import Optional
+
+import django
+
+
+def setup_worker(settings_module: str) -> None:
+    """
+    The setup_worker function initializes a pool process. Processes are started with the "spawn" method,
+    so they do not share database connections with the parent and must configure Django themselves.
+    This module must not import models at import time, since it is loaded before Django is set up.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    django.setup()
+
+
+def execute(job_id: int) -> Optional[str]:
+    """
+    The execute function is the entry point of a pool process. It runs a claimed job and returns its final status.
+    """
+    from jobs.registry import run_job
+
+    return run_job(job_id)
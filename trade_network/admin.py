@@ -1,9 +1,12 @@
-from typing import Tuple, List, Union
+from typing import Any, Dict, Tuple, List, Union
 from django.contrib import admin
 from django.db import models
 from django.db.models import QuerySet
+from django.utils import timezone
 from django.utils.html import format_html
 
+from jobs.models import Job
+from jobs.registry import submit
 from trade_network.models import Node, Contact, Product
 
 
@@ -34,7 +37,7 @@ class NodeAdmin(admin.ModelAdmin):
     inlines: List[admin.TabularInline] = [ContactInline, ProductInline, ]
     list_display: Tuple[str, ...] = ("id", "name", "level", "to_supplier", "debt_to_the_supplier")
     list_display_links: Tuple[str, ...] = ('name', 'to_supplier')
-    list_filter: Tuple[str, ...] = ('contact__city',)
+    list_filter: Tuple[str, ...] = ('is_active', 'contact__location__country', 'contact__location')
     fields: List[Union[Tuple[str, ...], str]] = [("id", "name"),
                                                  ("level", "supplier"),
                                                  "debt_to_the_supplier",
@@ -43,6 +46,7 @@ class NodeAdmin(admin.ModelAdmin):
     search_fields: Tuple[str, ...] = ("name",)
     save_on_top: bool = True
     actions: List[str] = ['clear_dept']
+    clear_dept_sync_limit: int = 1000
 
     def to_supplier(self, obj: Node):
         """
@@ -63,8 +67,36 @@ class NodeAdmin(admin.ModelAdmin):
         Функция clear_depth(self, request, queryset: QuerySet определяет метод класса NodeAdmin.
         Она принимает экземпляр своего собственного класса, объект request и объект queryset в качестве аргументов.
         Определяет действия, когда соответствующие действия выбраны в панели администратора.
+        Если выбрано больше clear_dept_sync_limit участников, ставит фоновую задачу в очередь вместо обновления
+        в рамках запроса. Выбор всех записей списка передается задаче фильтрами и строкой поиска списка,
+        а не первичными ключами, чтобы не загружать их в память и не сохранять в задаче.
         """
-        queryset.update(debt_to_the_supplier=0)
+        count: int = queryset.count()
+        if count <= self.clear_dept_sync_limit:
+            queryset.update(debt_to_the_supplier=0, updated_at=timezone.now())
+            return
+
+        if request.POST.get('select_across') != '1':
+            # Rows ticked on one page of the list, bounded by list_per_page
+            job: Job = submit('trade_network.clear_debt', user=request.user,
+                              ids=list(queryset.values_list('pk', flat=True)))
+        else:
+            filters, search = self.get_selection_filters(request)
+            job = submit('trade_network.clear_debt', user=request.user, filters=filters, search=search)
+        self.message_user(request, f'Clearing debt of {count} members is queued as job #{job.pk}')
+
+    def get_selection_filters(self, request) -> Tuple[Dict[str, Any], str]:
+        """
+        Функция get_selection_filters возвращает параметры фильтров списка участников сети на панели
+        администратора в виде аргументов метода filter и строку поиска списка.
+        """
+        changelist = self.get_changelist_instance(request)
+        filter_specs, _, remaining_lookup_params, _, _ = changelist.get_filters(request)
+        filters: Dict[str, Any] = {}
+        for spec in filter_specs:
+            filters.update(getattr(spec, 'used_parameters', {}))
+        filters.update(remaining_lookup_params)
+        return filters, changelist.query
 
 
 class ProductAdmin(admin.ModelAdmin):
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class TradeNetworkConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'trade_network'
+
+    def ready(self) -> None:
+        """
+        Функция ready переопределяет метод базового класса. Подключает сигналы, сбрасывающие кэш
+        участников сети при их изменении.
+        """
+        from trade_network import cache  # noqa: F401
@@ -0,0 +1,78 @@
+from typing import Callable, List, Optional
+
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery
+from django.utils import timezone
+
+from trade_network.cache import node_cache
+from trade_network.models import ArchivedContact, ArchivedNode, ArchivedProduct, Contact, Node, Product
+
+ARCHIVE_BATCH_SIZE: int = 500
+
+
+def archive_inactive(batch_size: int = ARCHIVE_BATCH_SIZE, progress: Optional[Callable[[int], None]] = None) -> int:
+    """
+    The archive_inactive function moves inactive nodes with their contacts and products from the hot tables
+    to the archive tables. Every batch is moved in its own short transaction, so row locks are held only
+    for batch_size nodes at a time. Buyers of an archived node become independent, like on deletion:
+    their supplier is cleared and the levels of their chains are corrected.
+    Calls progress with the number of archived nodes after every batch and returns the total number.
+    """
+    archived: int = 0
+    while True:
+        with transaction.atomic():
+            ids: List[int] = list(
+                Node.objects.select_for_update(skip_locked=True)
+                .filter(is_active=False)
+                .order_by("id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                return archived
+            archive_batch(ids)
+
+        archived += len(ids)
+        if progress is not None:
+            progress(archived)
+
+
+def archive_batch(ids: List[int]) -> None:
+    """
+    The archive_batch function copies the nodes with the given ids, their contacts and products to the archive
+    tables and deletes them from the hot tables. Buyers of the archived nodes start their own supply chains.
+    Must be called inside a transaction.
+    """
+    ArchivedNode.objects.bulk_create([
+        ArchivedNode(id=node["id"], name=node["name"], supplier_id=node["supplier_id"], level=node["level"],
+                     debt_to_the_supplier=node["debt_to_the_supplier"],
+                     date_of_creation=node["date_of_creation"], deactivated_at=node["deactivated_at"])
+        for node in Node.objects.filter(pk__in=ids).values(
+            "id", "name", "supplier_id", "level", "debt_to_the_supplier", "date_of_creation", "deactivated_at")
+    ])
+    ArchivedContact.objects.bulk_create([
+        ArchivedContact(id=contact["id"], member_id=contact["member_id"], email=contact["email"],
+                        country=contact["country"], city=contact["city"], street=contact["street"],
+                        house_number=contact["house_number"])
+        for contact in Contact.objects.filter(member_id__in=ids).values(
+            "id", "member_id", "email", "country", "city", "street", "house_number")
+    ])
+    ArchivedProduct.objects.bulk_create([
+        ArchivedProduct(**product)
+        for product in Product.objects.filter(owner_id__in=ids).values(
+            "id", "owner_id", "name", "model", "release_date", "selling_price")
+    ])
+
+    now = timezone.now()
+    buyer_ids: List[int] = list(
+        Node.objects.filter(supplier_id__in=ids).exclude(pk__in=ids).values_list("id", flat=True)
+    )
+    Node.objects.filter(supplier_id__in=buyer_ids).update(level=1, chain_id=F("supplier_id"), updated_at=now)
+    Node.objects.filter(pk__in=buyer_ids).update(supplier=None, level=0, chain_id=None, updated_at=now)
+    Product.objects.filter(owner_id__in=buyer_ids).update(chain_id=F("owner_id"))
+    Product.objects.filter(owner__supplier_id__in=buyer_ids).update(
+        chain_id=Subquery(Node.objects.filter(pk=OuterRef("owner_id")).values("supplier_id")[:1]))
+
+    Product.objects.filter(owner_id__in=ids).delete()
+    Contact.objects.filter(member_id__in=ids).delete()
+    Node.objects.filter(pk__in=ids).delete()
+    node_cache.invalidate_all()
@@ -0,0 +1,168 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from trade_network.models import Node
+
+NODE_REF_FIELDS: Tuple[str, ...] = ("id", "name", "level", "supplier_id", "is_active", "chain_id")
+NODE_CACHE_VERSION_KEY: str = "trade_network_node_cache_version"
+
+
+class NodeRef(NamedTuple):
+    """
+    Класс NodeRef - именованный кортеж с полями участника сети, нужными для разрешения поставщика по имени
+    и определения уровня иерархии.
+    """
+    id: int
+    name: str
+    level: int
+    supplier_id: Optional[int]
+    is_active: bool
+    chain_id: Optional[int]
+
+    def instance(self) -> Node:
+        """
+        Функция instance возвращает экземпляр класса Node с загруженными полями кортежа.
+        Остальные поля загружаются из базы данных при первом обращении к ним. Метод from_db ожидает
+        значения в порядке полей модели, поэтому они передаются в этом порядке, а не в порядке кортежа.
+        """
+        values = self._asdict()
+        field_names = [field.attname for field in Node._meta.concrete_fields if field.attname in values]
+        return Node.from_db(None, field_names, [values[name] for name in field_names])
+
+
+class NodeLookupCache:
+    """
+    Класс NodeLookupCache - ограниченный по размеру кэш участников сети в памяти процесса
+    с вытеснением давно не использованных записей (LRU). Записи ищутся по имени и по первичному ключу
+    и сбрасываются сигналами при переименовании, смене поставщика, деактивации и удалении участника.
+    Изменения, сделанные в других процессах, передаются через метку поколения в общем кэше Django
+    (NODE_CACHE_VERSION_KEY): любое изменение участников сети записывает новую метку, и при следующем поиске
+    каждый процесс очищает свой кэш. С кэшем Django в памяти процесса (LocMemCache) метка поколения
+    не общая, и расхождение с другими процессами ограничено только временем жизни записей.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.max_size: int = max_size
+        self.ttl: float = ttl
+        self.by_name: "OrderedDict[str, Tuple[NodeRef, float]]" = OrderedDict()
+        self.names: Dict[int, str] = {}
+        self.lock = threading.Lock()
+        self.generation: Optional[int] = None
+
+    def check_generation(self) -> None:
+        """
+        Функция check_generation сравнивает метку поколения в общем кэше с меткой, при которой были
+        загружены записи, и очищает кэш процесса, если участники сети изменились в другом процессе.
+        Если метки нет (например, она вытеснена из общего кэша), записывается новая.
+        """
+        generation: Optional[int] = cache.get(NODE_CACHE_VERSION_KEY)
+        if generation is None:
+            cache.add(NODE_CACHE_VERSION_KEY, time.time_ns(), timeout=None)
+            generation = cache.get(NODE_CACHE_VERSION_KEY)
+        if generation != self.generation:
+            with self.lock:
+                self.by_name.clear()
+                self.names.clear()
+                self.generation = generation
+
+    def get(self, name: str) -> Optional[NodeRef]:
+        """
+        Функция get возвращает участника сети по имени из кэша или, при промахе, из базы данных.
+        Возвращает None, если участника с таким именем нет.
+        """
+        self.check_generation()
+        with self.lock:
+            entry = self.by_name.get(name)
+            if entry is not None and entry[1] > time.monotonic():
+                self.by_name.move_to_end(name)
+                return entry[0]
+        return self.load(name=name)
+
+    def get_by_id(self, pk: int) -> Optional[NodeRef]:
+        """
+        Функция get_by_id возвращает участника сети по первичному ключу из кэша или из базы данных.
+        """
+        self.check_generation()
+        with self.lock:
+            name = self.names.get(pk)
+        if name is not None:
+            return self.get(name)
+        return self.load(pk=pk)
+
+    def load(self, **lookup) -> Optional[NodeRef]:
+        """
+        Функция load загружает участника сети из базы данных одним запросом и добавляет его в кэш,
+        вытесняя самую давно использованную запись при переполнении.
+        """
+        values = Node.objects.filter(**lookup).values_list(*NODE_REF_FIELDS).first()
+        if values is None:
+            return None
+        ref = NodeRef(*values)
+        with self.lock:
+            self.discard(ref.id)
+            self.by_name[ref.name] = (ref, time.monotonic() + self.ttl)
+            self.names[ref.id] = ref.name
+            while len(self.by_name) > self.max_size:
+                evicted, _ = self.by_name.popitem(last=False)
+                self.names.pop(evicted.id, None)
+        return ref
+
+    def discard(self, pk: int) -> None:
+        """
+        Функция discard удаляет запись из обоих индексов кэша. Вызывается под блокировкой.
+        """
+        name = self.names.pop(pk, None)
+        if name is not None:
+            self.by_name.pop(name, None)
+
+    def invalidate_all(self) -> None:
+        """
+        Функция invalidate_all записывает новую метку поколения в общий кэш, чтобы кэши всех процессов
+        были очищены при следующем поиске, и очищает кэш текущего процесса. Вызывается сигналами и после
+        изменения участников сети массовыми операциями, которые сигналы не отправляют.
+        """
+        cache.set(NODE_CACHE_VERSION_KEY, time.time_ns(), timeout=None)
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Функция clear очищает кэш текущего процесса.
+        """
+        with self.lock:
+            self.by_name.clear()
+            self.names.clear()
+
+
+node_cache = NodeLookupCache(max_size=settings.NODE_LOOKUP_CACHE_SIZE, ttl=settings.NODE_LOOKUP_CACHE_TTL)
+
+
+@receiver(post_save, sender=Node)
+def invalidate_saved_node(sender, instance: Node, created: bool, update_fields=None, **kwargs) -> None:
+    """
+    The invalidate_saved_node function is a signal receiver. When a save changed one of the cached fields -
+    the name, supplier, level, chain or activity, compared with the values loaded from the database -
+    it invalidates the lookup caches of all processes, so renames, supplier changes and deactivation are visible
+    to the next lookup. Creating a node changes no cached entry, and saves that only change other fields,
+    such as the debt or the contact of a PATCH, are skipped.
+    """
+    if created or (update_fields is not None and not set(update_fields) & set(NODE_REF_FIELDS)):
+        return
+    if not instance.lookup_fields_changed():
+        return
+    node_cache.invalidate_all()
+
+
+@receiver(post_delete, sender=Node)
+def invalidate_deleted_node(sender, instance: Node, **kwargs) -> None:
+    """
+    The invalidate_deleted_node function is a signal receiver. It invalidates the lookup caches of all processes,
+    since the deleted node and its buyers, whose supplier is reset by the deletion, may be cached anywhere.
+    """
+    node_cache.invalidate_all()
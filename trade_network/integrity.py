@@ -0,0 +1,123 @@
+from collections import Counter, defaultdict
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import BigIntegerField, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from trade_network.cache import node_cache
+from trade_network.models import Node, Product
+
+CHECK_CHUNK_SIZE: int = 10000
+REPAIR_BATCH_SIZE: int = 1000
+SAMPLE_SIZE: int = 10
+
+# Kinds of inconsistencies, in report order. Cycles, chains deeper than the hierarchy allows
+# and debts need a human decision and are only reported.
+ISSUES: Tuple[str, ...] = ("level", "chain", "product_chain", "contact", "cycle", "depth", "debt")
+REPAIRABLE: Tuple[str, ...] = ("level", "chain", "product_chain", "contact")
+
+
+def check_range(start: int, end: int, repair: bool = False, samples: int = SAMPLE_SIZE) -> Dict[str, Any]:
+    """
+    The check_range function verifies the nodes with ids in (start, end] and their products. The stored level
+    and chain key of every node are compared with its actual supplier chain, read with a single query joining
+    three supplier levels; nodes without a contact, with a negative debt or a debt without a supplier,
+    supplier cycles and chains deeper than the hierarchy are detected along the way. If repair is set,
+    levels, chain keys and product chain keys are rewritten and nodes without a contact are deactivated
+    in transactions of REPAIR_BATCH_SIZE rows. Returns the number of checked nodes, the number and sample ids
+    of every kind of issue and the number of repaired rows.
+    """
+    issues: Dict[str, List[int]] = defaultdict(list)
+    roots: Dict[int, int] = {}
+    levels: Dict[int, List[int]] = defaultdict(list)
+    checked: int = 0
+
+    rows = (
+        Node.objects
+        .filter(id__gt=start, id__lte=end)
+        .order_by()
+        .values_list("id", "level", "chain_id", "is_active", "debt_to_the_supplier", "contact__id",
+                     "supplier_id", "supplier__supplier_id", "supplier__supplier__supplier_id")
+    )
+    for node_id, level, chain_id, is_active, debt, contact_id, *suppliers in rows.iterator(chunk_size=2000):
+        checked += 1
+        if contact_id is None and is_active:
+            issues["contact"].append(node_id)
+        if debt < 0 or (debt != Decimal(0) and suppliers[0] is None):
+            issues["debt"].append(node_id)
+        if node_id in suppliers:
+            issues["cycle"].append(node_id)
+            continue
+        if suppliers[2] is not None:
+            issues["depth"].append(node_id)
+            continue
+        depth: int = sum(supplier is not None for supplier in suppliers)
+        root_id: Optional[int] = suppliers[depth - 1] if depth else None
+        roots[node_id] = root_id or node_id
+        if level != depth:
+            issues["level"].append(node_id)
+            levels[depth].append(node_id)
+        if chain_id != root_id:
+            issues["chain"].append(node_id)
+
+    products = (
+        Product.objects
+        .filter(owner_id__gt=start, owner_id__lte=end)
+        .order_by()
+        .values_list("id", "owner_id", "chain_id")
+    )
+    for product_id, owner_id, chain_id in products.iterator(chunk_size=2000):
+        if owner_id in roots and chain_id != roots[owner_id]:
+            issues["product_chain"].append(product_id)
+
+    repaired: Dict[str, int] = repair_issues(issues, levels) if repair else {}
+    return {
+        "checked": checked,
+        "issues": {kind: len(ids) for kind, ids in issues.items()},
+        "samples": {kind: ids[:samples] for kind, ids in issues.items()},
+        "repaired": repaired,
+    }
+
+
+def repair_issues(issues: Dict[str, List[int]], levels: Dict[int, List[int]]) -> Dict[str, int]:
+    """
+    The repair_issues function fixes the repairable issues found by check_range in batches, one transaction
+    per batch. Chain keys are recomputed in the database from the supplier chain, so a batch takes a single
+    UPDATE regardless of how many chains it spans. Node chain keys are fixed before product chain keys,
+    since the latter are copied from the owners. The node lookup caches of all processes are invalidated
+    after the repair.
+    """
+    repaired: Counter = Counter()
+    now = timezone.now()
+    grandparent = Subquery(Node.objects.filter(pk=OuterRef("supplier_id")).values("supplier_id")[:1])
+    owner_root = Subquery(Node.objects.filter(pk=OuterRef("owner_id")).values("chain_id")[:1])
+
+    for level, ids in levels.items():
+        for batch in batches(ids):
+            with transaction.atomic():
+                repaired["level"] += Node.objects.filter(pk__in=batch).update(level=level, updated_at=now)
+    for batch in batches(issues.get("chain", [])):
+        with transaction.atomic():
+            repaired["chain"] += Node.objects.filter(pk__in=batch).update(
+                chain_id=Coalesce(grandparent, F("supplier_id"), output_field=BigIntegerField()), updated_at=now)
+    for batch in batches(issues.get("product_chain", [])):
+        with transaction.atomic():
+            repaired["product_chain"] += Product.objects.filter(pk__in=batch).update(
+                chain_id=Coalesce(owner_root, F("owner_id"), output_field=BigIntegerField()))
+    for batch in batches(issues.get("contact", [])):
+        with transaction.atomic():
+            repaired["contact"] += Node.objects.filter(pk__in=batch, is_active=True).update(
+                is_active=False, deactivated_at=now, updated_at=now)
+    if repaired:
+        node_cache.invalidate_all()
+    return dict(repaired)
+
+
+def batches(ids: List[int], size: int = REPAIR_BATCH_SIZE) -> List[List[int]]:
+    """
+    The batches function is a utility function. It splits a list of ids into lists of at most size ids.
+    """
+    return [ids[start:start + size] for start in range(0, len(ids), size)]
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from trade_network.archive import ARCHIVE_BATCH_SIZE, archive_inactive
+
+
+class Command(BaseCommand):
+    """
+    Класс Command наследуется от класса BaseCommand из модуля django.core.management.base.
+    Переносит неактивных участников сети с их контактами и продуктами в архивные таблицы пакетами.
+    """
+    help: str = 'Move inactive trading network members to the archive tables in batches'
+    requires_system_checks: list = []
+
+    def add_arguments(self, parser) -> None:
+        """
+        Функция add_arguments определяет параметры команды: количество участников сети в одной транзакции.
+        """
+        parser.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE)
+
+    def handle(self, *args, **options) -> None:
+        """
+        Функция handle выполняет перенос и выводит количество перенесенных участников сети после каждого пакета.
+        """
+        archived: int = archive_inactive(
+            batch_size=options['batch_size'],
+            progress=lambda count: self.stdout.write(f'{count} archived'),
+        )
+        self.stdout.write(f'Done, {archived} members archived')
@@ -0,0 +1,97 @@
+import json
+import timeit
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Any, Callable, Dict, List
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from config.parsers import MessagePackParser
+from config.renderers import MessagePackRenderer
+from trade_network.models import Contact, Node
+from trade_network.serializers import NodeListSerializer
+
+
+class Command(BaseCommand):
+    """
+    Класс Command наследуется от класса BaseCommand из модуля django.core.management.base.
+    Сравнивает размер ответа и время кодирования и декодирования страницы списка участников сети
+    в форматах JSON и MessagePack. Страница - вывод NodeListSerializer для участников сети, созданных в памяти,
+    база данных не используется.
+    """
+    help: str = 'Compare JSON and MessagePack payload size and encode/decode time for a node list page'
+
+    def add_arguments(self, parser) -> None:
+        """
+        Функция add_arguments определяет параметры команды: количество участников сети на странице
+        и количество повторов измерения.
+        """
+        parser.add_argument('--nodes', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options) -> None:
+        """
+        Функция handle выполняет измерения и выводит таблицу с результатами. Для каждого формата
+        выводится лучшее время из заданного количества повторов.
+        """
+        page: Dict[str, Any] = build_page(options['nodes'])
+        repeat: int = options['repeat']
+
+        json_renderer = JSONRenderer()
+        msgpack_renderer = MessagePackRenderer()
+        msgpack_parser = MessagePackParser()
+
+        json_body: bytes = json_renderer.render(page)
+        msgpack_body: bytes = msgpack_renderer.render(page)
+
+        results: List[tuple] = [
+            ('json', len(json_body),
+             best_time(lambda: json_renderer.render(page), repeat),
+             best_time(lambda: json.loads(json_body), repeat)),
+            ('msgpack', len(msgpack_body),
+             best_time(lambda: msgpack_renderer.render(page), repeat),
+             best_time(lambda: msgpack_parser.parse(BytesStream(msgpack_body)), repeat)),
+        ]
+
+        self.stdout.write(f'{options["nodes"]} nodes per page, best of {repeat}')
+        self.stdout.write(f'{"format":<10}{"bytes":>12}{"encode, ms":>14}{"decode, ms":>14}')
+        for name, size, encode, decode in results:
+            self.stdout.write(f'{name:<10}{size:>12}{encode * 1000:>14.1f}{decode * 1000:>14.1f}')
+
+
+class BytesStream:
+    """
+    Класс BytesStream - минимальный поток с методом read, передаваемый парсеру вместо тела запроса.
+    """
+
+    def __init__(self, data: bytes) -> None:
+        self.data: bytes = data
+
+    def read(self) -> bytes:
+        return self.data
+
+
+def best_time(func: Callable[[], Any], repeat: int) -> float:
+    """
+    The best_time function is a utility function. It runs the function the given number of times
+    and returns the best execution time in seconds.
+    """
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def build_page(count: int) -> Dict[str, Any]:
+    """
+    The build_page function is a utility function. It returns a LimitOffsetPagination page of the given
+    number of nodes serialized by NodeListSerializer. The nodes, their suppliers and contacts are built
+    in memory, so the output is exactly what the API returns without touching the database.
+    """
+    nodes: List[Node] = []
+    for pk in range(1, count + 1):
+        level: int = (pk - 1) % 3
+        node = Node(id=pk, name=f'Retail network member {pk}', level=level,
+                    supplier=nodes[-1] if level else None, debt_to_the_supplier=Decimal(pk % 100000) / 100)
+        Contact(member=node, email=f'member{pk}@example.com', country='Russia', city='Moscow',
+                street='Tverskaya', house_number=str(pk % 200), location_id=pk % 50 + 1)
+        nodes.append(node)
+    return OrderedDict(count=count, next=None, previous=None, results=NodeListSerializer(nodes, many=True).data)
@@ -0,0 +1,91 @@
+import statistics
+import threading
+import time
+import uuid
+from typing import List
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection
+from rest_framework.exceptions import ValidationError
+
+from trade_network.models import Node
+from trade_network.serializers import NodeCreateSerializer
+
+
+class Command(BaseCommand):
+    """
+    Класс Command наследуется от класса BaseCommand из модуля django.core.management.base.
+    Измеряет устойчивую скорость создания участников сети с контактами через NodeCreateSerializer
+    при нескольких одновременных клиентах. Каждый клиент работает в своем потоке со своим соединением
+    с базой данных. Созданные записи удаляются по окончании измерения.
+    """
+    help: str = 'Measure the sustained node-with-contact create rate under concurrent clients'
+
+    def add_arguments(self, parser) -> None:
+        """
+        Функция add_arguments определяет параметры команды: количество клиентов, длительность измерения,
+        имя поставщика создаваемых участников сети и отказ от удаления созданных записей.
+        """
+        parser.add_argument('--clients', type=int, default=4)
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds')
+        parser.add_argument('--supplier', help='Name of an existing supplier; a temporary factory by default')
+        parser.add_argument('--keep', action='store_true', help='Do not delete the created members')
+
+    def handle(self, *args, **options) -> None:
+        """
+        Функция handle запускает клиентов, ожидает окончания измерения и выводит количество созданных
+        участников сети в секунду, ошибки и перцентили времени создания.
+        """
+        prefix: str = f'bench-{uuid.uuid4().hex[:8]}'
+        supplier: str = options['supplier']
+        if supplier is None:
+            supplier = Node.objects.create(name=f'{prefix}-factory', level=0).name
+        elif not Node.active.filter(name=supplier).exists():
+            raise CommandError(f'Active supplier "{supplier}" not found')
+
+        latencies: List[List[float]] = [[] for _ in range(options['clients'])]
+        errors: List[int] = [0] * options['clients']
+        deadline: float = time.perf_counter() + options['duration']
+
+        def client(number: int) -> None:
+            try:
+                sequence: int = 0
+                while time.perf_counter() < deadline:
+                    sequence += 1
+                    started: float = time.perf_counter()
+                    serializer = NodeCreateSerializer(data={
+                        'name': f'{prefix}-{number}-{sequence}',
+                        'supplier': supplier,
+                        'contact': {'email': f'{prefix}-{number}-{sequence}@example.com', 'country': 'Russia',
+                                    'city': 'Moscow', 'street': 'Tverskaya', 'house_number': str(sequence % 200)},
+                    })
+                    try:
+                        serializer.is_valid(raise_exception=True)
+                        serializer.save()
+                    except (DatabaseError, ValidationError):
+                        errors[number] += 1
+                        continue
+                    latencies[number].append(time.perf_counter() - started)
+            finally:
+                connection.close()
+
+        threads: List[threading.Thread] = [
+            threading.Thread(target=client, args=(number,)) for number in range(options['clients'])
+        ]
+        started: float = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed: float = time.perf_counter() - started
+
+        times: List[float] = sorted(latency for client_latencies in latencies for latency in client_latencies)
+        self.stdout.write(f'{options["clients"]} clients, {elapsed:.1f} s')
+        self.stdout.write(f'created {len(times)} ({len(times) / elapsed:.0f}/s), errors {sum(errors)}')
+        if len(times) > 1:
+            quantiles: List[float] = statistics.quantiles(times, n=100)
+            self.stdout.write(f'latency, ms: p50 {quantiles[49] * 1000:.2f}, p95 {quantiles[94] * 1000:.2f}, '
+                              f'p99 {quantiles[98] * 1000:.2f}, max {times[-1] * 1000:.2f}')
+
+        if not options['keep']:
+            Node.objects.filter(name__startswith=prefix).delete()
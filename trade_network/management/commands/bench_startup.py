@@ -0,0 +1,108 @@
+import base64
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+WSGI_PROBE: str = '''
+import json, os, sys, time
+started = time.perf_counter()
+from config.wsgi import application
+loaded = time.perf_counter()
+from wsgiref.util import setup_testing_defaults
+environ = {"PATH_INFO": sys.argv[1]}
+if os.environ.get("BENCH_AUTHORIZATION"):
+    environ["HTTP_AUTHORIZATION"] = os.environ["BENCH_AUTHORIZATION"]
+setup_testing_defaults(environ)
+status = []
+b"".join(application(environ, lambda code, headers, exc_info=None: status.append(int(code.split()[0]))))
+served = time.perf_counter()
+print(json.dumps({"load": loaded - started, "request": served - loaded, "status": status[0]}))
+'''
+
+ASGI_PROBE: str = '''
+import asyncio, json, os, sys, time
+started = time.perf_counter()
+from config.asgi import application
+loaded = time.perf_counter()
+status = []
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+async def send(message):
+    if message["type"] == "http.response.start":
+        status.append(message["status"])
+
+scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+         "path": sys.argv[1], "raw_path": sys.argv[1].encode(), "query_string": b"", "root_path": "",
+         "headers": [(b"host", b"localhost")], "client": ("127.0.0.1", 0), "server": ("localhost", 80)}
+if os.environ.get("BENCH_AUTHORIZATION"):
+    scope["headers"].append((b"authorization", os.environ["BENCH_AUTHORIZATION"].encode()))
+asyncio.run(application(scope, receive, send))
+served = time.perf_counter()
+print(json.dumps({"load": loaded - started, "request": served - loaded, "status": status[0]}))
+'''
+
+
+class Command(BaseCommand):
+    """
+    Класс Command наследуется от класса BaseCommand из модуля django.core.management.base.
+    Измеряет время холодного запуска до обработки первого запроса для config.wsgi и config.asgi.
+    Каждый запуск выполняется в новом процессе интерпретатора, выводятся медианы времени загрузки приложения,
+    первого запроса и всего процесса. По умолчанию запрашивается схема API, доступная без аутентификации;
+    для адресов, требующих входа, передаются имя пользователя и пароль (Basic-аутентификация).
+    Запуск с ответом 400 и выше завершает команду с ошибкой, чтобы не измерять обработку ошибки.
+    """
+    help: str = 'Benchmark cold start to the first served request for config.wsgi and config.asgi'
+    requires_system_checks: list = []
+
+    def add_arguments(self, parser) -> None:
+        """
+        Функция add_arguments определяет параметры команды: количество запусков, адрес первого запроса
+        и учетные данные пользователя для адресов, требующих аутентификации.
+        """
+        parser.add_argument('--runs', type=int, default=10)
+        parser.add_argument('--path', default='/schema')
+        parser.add_argument('--username', help='Send the request with HTTP Basic authentication')
+        parser.add_argument('--password', default='')
+
+    def handle(self, *args, **options) -> None:
+        """
+        Функция handle выполняет запуски для каждого интерфейса и выводит таблицу с медианами в миллисекундах.
+        """
+        env: Dict[str, str] = dict(os.environ)
+        if options['username']:
+            credentials: bytes = f'{options["username"]}:{options["password"]}'.encode()
+            env['BENCH_AUTHORIZATION'] = 'Basic ' + base64.b64encode(credentials).decode()
+
+        self.stdout.write(f'{options["runs"]} cold starts, GET {options["path"]}, median ms')
+        self.stdout.write(f'{"entry":<8}{"load app":>10}{"request":>10}{"process":>10}  status')
+        for name, probe in (('wsgi', WSGI_PROBE), ('asgi', ASGI_PROBE)):
+            runs: List[Dict[str, float]] = [self.run_probe(probe, options['path'], env) for _ in range(options['runs'])]
+            load, request, process = (statistics.median(run[key] for run in runs) * 1000
+                                      for key in ('load', 'request', 'process'))
+            self.stdout.write(f'{name:<8}{load:>10.1f}{request:>10.1f}{process:>10.1f}  {runs[-1]["status"]}')
+
+    def run_probe(self, probe: str, path: str, env: Dict[str, str]) -> Dict[str, float]:
+        """
+        Функция run_probe запускает измерение в новом процессе и возвращает его результаты
+        вместе с общим временем работы процесса, включающим запуск интерпретатора.
+        """
+        started: float = time.perf_counter()
+        process = subprocess.run([sys.executable, '-c', probe, path], capture_output=True, text=True,
+                                 env=env, cwd=settings.BASE_DIR)
+        finished: float = time.perf_counter()
+        if process.returncode:
+            raise CommandError(process.stderr)
+        result: Dict[str, float] = json.loads(process.stdout.splitlines()[-1])
+        if result['status'] >= 400:
+            raise CommandError(f'GET {path} returned {result["status"]}; pass --username and --password '
+                               f'or a path served without authentication')
+        return dict(result, process=finished - started)
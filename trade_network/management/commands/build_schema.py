@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from config.schema import write_schema
+
+
+class Command(BaseCommand):
+    """
+    Класс Command наследуется от класса BaseCommand из модуля django.core.management.base.
+    Генерирует OpenAPI схему всех конечных точек проекта и записывает ее в файл OPENAPI_SCHEMA_PATH,
+    откуда ее отдает представление SchemaView. Выполняется при сборке или развертывании.
+    """
+    help: str = 'Generate the OpenAPI schema into the file served at /schema'
+
+    def add_arguments(self, parser) -> None:
+        """
+        Функция add_arguments определяет параметры команды: путь к файлу схемы.
+        """
+        parser.add_argument('--output', default=str(settings.OPENAPI_SCHEMA_PATH))
+
+    def handle(self, *args, **options) -> None:
+        """
+        Функция handle генерирует схему, записывает ее в файл и выводит размер файла.
+        """
+        content: bytes = write_schema(options['output'])
+        self.stdout.write(f'Schema written to {options["output"]} ({len(content)} bytes)')
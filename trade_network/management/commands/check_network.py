@@ -0,0 +1,79 @@
+import multiprocessing
+import os
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max
+
+from jobs.worker import setup_worker
+from trade_network.integrity import CHECK_CHUNK_SIZE, ISSUES, REPAIRABLE, SAMPLE_SIZE, check_range
+from trade_network.models import Node
+
+
+class Command(BaseCommand):
+    """
+    Класс Command наследуется от класса BaseCommand из модуля django.core.management.base.
+    Проверяет целостность торговой сети: соответствие уровня и ключа цепочки участников сети их поставщикам,
+    отсутствие циклов, наличие контактов и корректность задолженности. Таблица обходится диапазонами
+    первичных ключей в пуле процессов, с параметром --repair исправимые ошибки исправляются пакетами.
+    Завершается с ошибкой, если остались неисправленные нарушения.
+    """
+    help: str = 'Check the consistency of the trading network hierarchy and optionally repair it'
+    requires_system_checks: list = []
+
+    def add_arguments(self, parser) -> None:
+        """
+        Функция add_arguments определяет параметры команды: количество процессов, размер диапазона
+        первичных ключей, режим исправления и количество выводимых примеров каждого нарушения.
+        """
+        parser.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--chunk-size', type=int, default=CHECK_CHUNK_SIZE)
+        parser.add_argument('--repair', action='store_true',
+                            help='Fix levels and chain keys, deactivate members without a contact')
+        parser.add_argument('--samples', type=int, default=SAMPLE_SIZE)
+
+    def handle(self, *args, **options) -> None:
+        """
+        Функция handle распределяет диапазоны первичных ключей по процессам, суммирует результаты
+        и выводит количество нарушений каждого вида с примерами и скорость проверки.
+        """
+        chunk_size: int = options['chunk_size']
+        last_id: int = Node.objects.aggregate(last_id=Max('id'))['last_id'] or 0
+        checked: int = 0
+        found: Counter = Counter()
+        repaired: Counter = Counter()
+        samples: Dict[str, List[int]] = defaultdict(list)
+
+        started: float = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=options['processes'], mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=setup_worker,
+                                 initargs=(os.environ['DJANGO_SETTINGS_MODULE'],)) as pool:
+            futures = [pool.submit(check_range, start, start + chunk_size, options['repair'], options['samples'])
+                       for start in range(0, last_id, chunk_size)]
+            for future in as_completed(futures):
+                result = future.result()
+                checked += result['checked']
+                found.update(result['issues'])
+                repaired.update(result['repaired'])
+                for kind, ids in result['samples'].items():
+                    samples[kind].extend(ids)
+        elapsed: float = time.perf_counter() - started
+
+        self.stdout.write(f'Checked {checked} members in {elapsed:.1f} s '
+                          f'({checked / elapsed if elapsed else 0:.0f} members/s, {options["processes"]} processes)')
+        for kind in ISSUES:
+            if not found[kind]:
+                continue
+            line: str = f'{kind}: {found[kind]}'
+            if kind in REPAIRABLE and options['repair']:
+                line += f', repaired {repaired[kind]}'
+            example: str = ', '.join(str(pk) for pk in sorted(samples[kind])[:options['samples']])
+            self.stdout.write(f'{line} (e.g. {example})')
+
+        left: int = sum(found.values()) - sum(repaired.values())
+        if left:
+            raise CommandError(f'{left} inconsistencies left')
+        self.stdout.write('No inconsistencies left' if found else 'No inconsistencies found')
@@ -0,0 +1,75 @@
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)$')
+
+
+class Command(BaseCommand):
+    """
+    Класс Command наследуется от класса BaseCommand из модуля django.core.management.base.
+    Измеряет время импорта модулей при запуске проекта в отдельном процессе интерпретатора
+    с параметром -X importtime и выводит самые медленные модули или пакеты.
+    """
+    help: str = 'Report per-module import time of the Django setup in a fresh interpreter'
+    requires_system_checks: list = []
+
+    def add_arguments(self, parser) -> None:
+        """
+        Функция add_arguments определяет параметры команды: количество строк отчета, группировку
+        по пакетам верхнего уровня и импорт URL-конфигурации, как при обработке первого запроса.
+        """
+        parser.add_argument('--top', type=int, default=30)
+        parser.add_argument('--packages', action='store_true', help='Group self time by top-level package')
+        parser.add_argument('--urls', action='store_true', help='Also import ROOT_URLCONF, as the first request does')
+
+    def handle(self, *args, **options) -> None:
+        """
+        Функция handle запускает измерение и выводит отчет. Для модулей выводится собственное
+        и накопленное время импорта, для пакетов - сумма собственного времени их модулей.
+        """
+        code: str = 'import django; django.setup()'
+        if options['urls']:
+            code += f'; import {settings.ROOT_URLCONF}'
+
+        env: Dict[str, str] = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ['DJANGO_SETTINGS_MODULE'])
+        process = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                                 capture_output=True, text=True, env=env, cwd=settings.BASE_DIR)
+        if process.returncode:
+            raise CommandError(process.stderr)
+
+        modules: List[Tuple[int, int, str]] = parse_import_times(process.stderr)
+        total: int = sum(own for own, _, _ in modules)
+
+        if options['packages']:
+            packages: Dict[str, int] = defaultdict(int)
+            for own, _, name in modules:
+                packages[name.split('.')[0]] += own
+            self.stdout.write(f'{"self, ms":>10}  package')
+            for name, own in sorted(packages.items(), key=lambda item: -item[1])[:options['top']]:
+                self.stdout.write(f'{own / 1000:>10.1f}  {name}')
+        else:
+            self.stdout.write(f'{"self, ms":>10}{"cumulative, ms":>16}  module')
+            for own, cumulative, name in sorted(modules, key=lambda item: -item[1])[:options['top']]:
+                self.stdout.write(f'{own / 1000:>10.1f}{cumulative / 1000:>16.1f}  {name}')
+
+        self.stdout.write(f'{len(modules)} modules imported in {total / 1000:.1f} ms')
+
+
+def parse_import_times(output: str) -> List[Tuple[int, int, str]]:
+    """
+    The parse_import_times function is a utility function. It parses the output of "python -X importtime"
+    and returns the self time and the cumulative time in microseconds and the name of every imported module.
+    """
+    modules: List[Tuple[int, int, str]] = []
+    for line in output.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            modules.append((int(match.group(1)), int(match.group(2)), match.group(4)))
+    return modules
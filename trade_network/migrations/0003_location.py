@@ -0,0 +1,86 @@
+# Generated by Django 4.2.3 on 2026-10-19 06:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def location_key(value):
+    return " ".join((value or "").split()).casefold()
+
+
+def link_contacts_to_locations(apps, schema_editor):
+    """
+    Deduplicates the free-text country and city values of existing contacts into the Country and City tables
+    and links every contact to its city. Contacts are processed in batches.
+    """
+    Contact = apps.get_model("trade_network", "Contact")
+    Country = apps.get_model("trade_network", "Country")
+    City = apps.get_model("trade_network", "City")
+    countries = {}
+    cities = {}
+    batch = []
+
+    for contact in Contact.objects.only("id", "country", "city").order_by("id").iterator(chunk_size=2000):
+        country_key, city_key = location_key(contact.country), location_key(contact.city)
+        if not country_key and not city_key:
+            continue
+        if country_key not in countries:
+            countries[country_key] = Country.objects.create(key=country_key, name=" ".join((contact.country or "").split()))
+        if (country_key, city_key) not in cities:
+            cities[country_key, city_key] = City.objects.create(
+                country=countries[country_key], key=city_key, name=" ".join((contact.city or "").split())
+            )
+        contact.location = cities[country_key, city_key]
+        batch.append(contact)
+        if len(batch) >= 2000:
+            Contact.objects.bulk_update(batch, ["location"])
+            batch = []
+
+    Contact.objects.bulk_update(batch, ["location"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trade_network', '0002_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Country',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50)),
+                ('key', models.CharField(max_length=50, unique=True)),
+            ],
+            options={
+                'verbose_name': 'country',
+                'verbose_name_plural': 'countries',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='City',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50)),
+                ('key', models.CharField(max_length=50)),
+                ('country', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cities', to='trade_network.country')),
+            ],
+            options={
+                'verbose_name': 'city',
+                'verbose_name_plural': 'cities',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='contact',
+            name='location',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='contacts', to='trade_network.city'),
+        ),
+        migrations.AddConstraint(
+            model_name='city',
+            constraint=models.UniqueConstraint(fields=('country', 'key'), name='unique_city_in_country'),
+        ),
+        migrations.RunPython(link_contacts_to_locations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 4.2.3 on 2026-10-19 06:19
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def create_brin_index(apps, schema_editor):
+    """
+    Adds a BRIN index on the time of the price change. History rows are appended in time order,
+    so on PostgreSQL a BRIN index stays tiny while serving time range scans over the whole table.
+    """
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX price_history_changed_at_brin ON trade_network_pricehistory USING brin (changed_at)"
+        )
+
+
+def drop_brin_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS price_history_changed_at_brin")
+
+
+def record_current_prices(apps, schema_editor):
+    """
+    Starts the price history of existing products with their current prices.
+    """
+    Product = apps.get_model("trade_network", "Product")
+    PriceHistory = apps.get_model("trade_network", "PriceHistory")
+    changed_at = django.utils.timezone.now()
+    batch = []
+    for pk, price in Product.objects.order_by("pk").values_list("pk", "selling_price").iterator(chunk_size=2000):
+        batch.append(PriceHistory(product_id=pk, price=price, changed_at=changed_at))
+        if len(batch) >= 2000:
+            PriceHistory.objects.bulk_create(batch)
+            batch = []
+    PriceHistory.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trade_network', '0003_location'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PriceHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('product', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='price_history', to='trade_network.product')),
+            ],
+            options={
+                'verbose_name': 'price history entry',
+                'verbose_name_plural': 'price history',
+                'indexes': [models.Index(fields=['product', 'changed_at'], name='price_history_product_time')],
+            },
+        ),
+        migrations.RunPython(create_brin_index, drop_brin_index),
+        migrations.RunPython(record_current_prices, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 4.2.3 on 2026-10-19 06:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trade_network', '0004_price_history'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedContact',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('email', models.EmailField(blank=True, max_length=254, null=True)),
+                ('country', models.CharField(blank=True, max_length=50, null=True)),
+                ('city', models.CharField(blank=True, max_length=50, null=True)),
+                ('street', models.CharField(blank=True, max_length=50, null=True)),
+                ('house_number', models.CharField(blank=True, max_length=10, null=True)),
+            ],
+            options={
+                'verbose_name': 'archived contact',
+                'verbose_name_plural': 'archived contacts',
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedNode',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=300)),
+                ('supplier_id', models.BigIntegerField(blank=True, null=True)),
+                ('level', models.IntegerField()),
+                ('debt_to_the_supplier', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('date_of_creation', models.DateTimeField()),
+                ('deactivated_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'archived trading network member',
+                'verbose_name_plural': 'archived trading network members',
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedProduct',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=150)),
+                ('model', models.CharField(max_length=100)),
+                ('release_date', models.DateField()),
+                ('selling_price', models.DecimalField(decimal_places=2, max_digits=10)),
+            ],
+            options={
+                'verbose_name': 'archived product',
+                'verbose_name_plural': 'archived products',
+            },
+        ),
+        migrations.AddField(
+            model_name='node',
+            name='deactivated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='node',
+            name='is_active',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddIndex(
+            model_name='node',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['level', 'id'], name='node_active_level'),
+        ),
+        migrations.AddField(
+            model_name='archivedproduct',
+            name='owner',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='products', to='trade_network.archivednode'),
+        ),
+        migrations.AddField(
+            model_name='archivedcontact',
+            name='member',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='contact', to='trade_network.archivednode'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.3 on 2026-10-19 06:26
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_chain_ids(apps, schema_editor):
+    """
+    Fills the supply chain key of existing nodes level by level, then of their products.
+    """
+    Node = apps.get_model("trade_network", "Node")
+    Product = apps.get_model("trade_network", "Product")
+
+    def chain_root(node_id_field):
+        root = Coalesce("chain_id", "id", output_field=models.BigIntegerField())
+        return Subquery(Node.objects.filter(pk=OuterRef(node_id_field)).values(root=root)[:1])
+
+    Node.objects.filter(supplier__isnull=False, supplier__supplier__isnull=True).update(
+        chain_id=chain_root("supplier_id"))
+    Node.objects.filter(supplier__supplier__isnull=False).update(chain_id=chain_root("supplier_id"))
+    Product.objects.update(chain_id=chain_root("owner_id"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trade_network', '0005_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='node',
+            name='chain_id',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='chain_id',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='node',
+            index=models.Index(fields=['chain_id', 'level', 'id'], name='node_chain_level'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['chain_id', 'name', 'model'], name='product_chain_name'),
+        ),
+        migrations.RunPython(fill_chain_ids, migrations.RunPython.noop),
+    ]
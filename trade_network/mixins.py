@@ -0,0 +1,113 @@
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Q, QuerySet
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    """
+    Класс ConditionalGetMixin - примесь к представлениям на основе класса из модуля rest_framework.generics.
+    Обрабатывает условные GET-запросы с заголовками If-None-Match и If-Modified-Since. Строгий ETag вычисляется
+    по дешевой метке версии (агрегату полей updated_at), поэтому ответ 304 Not Modified отдается без загрузки
+    и сериализации объектов. Представление определяет метод get_version_stamp; без него запросы обрабатываются
+    обычным образом, без заголовков ETag и Last-Modified.
+    """
+
+    def get_version_stamp(self) -> Tuple[Optional[Dict[str, Any]], Optional[datetime]]:
+        """
+        Функция get_version_stamp возвращает словарь значений, меняющихся при любом изменении ответа,
+        и время последнего изменения ресурса (или None, если заголовок Last-Modified не подходит ресурсу).
+        Если ресурс не найден, словарь равен None и запрос обрабатывается обычным образом. По умолчанию
+        возвращает (None, None), то есть условные запросы не поддерживаются.
+        """
+        return None, None
+
+    def get_etag(self, stamp: Dict[str, Any]) -> str:
+        """
+        Функция get_etag строит строгий ETag из метки версии, полного адреса запроса
+        и формата ответа, выбранного при согласовании содержимого.
+        """
+        source: str = repr((sorted(stamp.items()), self.request.get_full_path(), self.request.accepted_renderer.format))
+        return '"%s"' % hashlib.md5(source.encode()).hexdigest()
+
+    def get(self, request, *args, **kwargs) -> Response:
+        """
+        Функция get переопределяет метод базового класса. Если ETag или время изменения ресурса совпадают
+        с указанными клиентом, возвращает ответ 304 Not Modified без тела. Иначе вызывает метод базового класса
+        и добавляет к ответу заголовки ETag и Last-Modified.
+        """
+        stamp, last_modified = self.get_version_stamp()
+        if stamp is None:
+            return super().get(request, *args, **kwargs)
+
+        etag: str = self.get_etag(stamp)
+        timestamp: Optional[int] = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        return response
+
+
+class ChainScopedMixin:
+    """
+    Класс ChainScopedMixin - примесь к представлениям на основе класса из модуля rest_framework.generics.
+    Если включен параметр TRADE_NETWORK_CHAIN_SCOPING, для пользователей, не являющихся сотрудниками, ограничивает
+    набор объектов представления цепочкой поставок пользователя по ключу chain_lookup (и первичному ключу завода по
+    chain_root_lookup), чтобы запросы читали только записи цепочки по составным индексам.
+    """
+    chain_lookup: str = "chain_id"
+    chain_root_lookup: Optional[str] = None
+
+    def get_chain_root_id(self) -> Optional[int]:
+        """
+        Функция get_chain_root_id возвращает первичный ключ завода цепочки поставок пользователя,
+        сделавшего запрос, или None, если выборка не ограничивается (параметр выключен или пользователь
+        является сотрудником, а также при генерации схемы API без запроса). Пользователю без цепочки (в том числе
+        после архивации ее завода) возвращается 0 - этот ключ не совпадает ни с одним участником сети,
+        поэтому выборка пуста.
+        """
+        user = getattr(self.request, "user", None)
+        if not settings.TRADE_NETWORK_CHAIN_SCOPING or user is None or user.is_staff:
+            return None
+        return getattr(user, "chain_id", None) or 0
+
+    def scope_to_chain(self, queryset: QuerySet) -> QuerySet:
+        """
+        Функция scope_to_chain ограничивает набор объектов цепочкой поставок пользователя.
+        """
+        root_id: Optional[int] = self.get_chain_root_id()
+        if root_id is None:
+            return queryset
+        condition = Q(**{self.chain_lookup: root_id})
+        if self.chain_root_lookup:
+            condition |= Q(**{self.chain_root_lookup: root_id})
+        return queryset.filter(condition)
+
+    def get_queryset(self) -> QuerySet:
+        """
+        Функция get_queryset переопределяет метод родительского класса и ограничивает набор объектов
+        цепочкой поставок пользователя.
+        """
+        return self.scope_to_chain(super().get_queryset())
+
+    def check_supplier_chain(self, supplier) -> None:
+        """
+        Функция check_supplier_chain вызывает исключение PermissionDenied, если пользователь, ограниченный
+        цепочкой поставок, указывает поставщика из другой цепочки или создает новую цепочку.
+        """
+        root_id: Optional[int] = self.get_chain_root_id()
+        if root_id is not None and (supplier is None or supplier.chain_root_id != root_id):
+            raise PermissionDenied("The supplier must belong to your supply chain")
@@ -1,18 +1,69 @@
 from datetime import datetime
-from typing import List
-from django.db import models
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from django.db import models, transaction
+from django.utils import timezone
+
+PRICE_HISTORY_BATCH_SIZE: int = 1000
+
+# Fields of a node kept by the lookup cache (trade_network.cache); their loaded values are remembered
+# so that only renames, supplier and level changes, deactivation and chain moves invalidate the cache
+LOOKUP_FIELDS: Tuple[str, ...] = ("name", "supplier_id", "level", "is_active", "chain_id")
+
+
+def location_key(value: Optional[str]) -> str:
+    """
+    The location_key function is a utility function. It takes a free-text country or city name and returns
+    its normalized form used to deduplicate locations: whitespace is collapsed and the case is folded.
+    """
+    return " ".join((value or "").split()).casefold()
+
+
+def fields_except(instance: models.Model, excluded: str) -> List[str]:
+    """
+    The fields_except function is a utility function. It returns the names of the loaded concrete fields
+    of a model instance except the primary key and the excluded field, to save an existing instance
+    without overwriting a field that bulk updates may have changed since it was loaded.
+    """
+    return [field.name for field in instance._meta.concrete_fields
+            if not field.primary_key and field.name != excluded and field.attname in instance.__dict__]
+
+
+class ActiveNodeManager(models.Manager):
+    """
+    Класс ActiveNodeManager наследуется от класса Manager из модуля django.db.models.
+    Возвращает только действующих участников сети, без удаленных в архив.
+    """
+
+    def get_queryset(self) -> models.QuerySet:
+        """
+        Функция get_queryset переопределяет метод базового класса и исключает неактивных участников сети.
+        """
+        return super().get_queryset().filter(is_active=True)
 
 
 class Node(models.Model):
     """
     Класс Node наследуется от базового класса Model из модуля django.db.models.
     Определяет поля таблицы базы данных, их свойства и ограничения.
+    Удаление через API только помечает участника сети неактивным, после чего он переносится
+    в архивные таблицы пакетной операцией archive_inactive.
+    Поле chain_id - ключ цепочки поставок: первичный ключ завода в корне цепочки (у самого завода пустое).
+    Оно денормализовано в продукты и входит в составные индексы, поэтому запросы в пределах одной цепочки
+    читают только ее записи.
     """
     name = models.CharField(max_length=300, unique=True)
     supplier = models.ForeignKey('self', null=True, blank=True, default=None, on_delete=models.SET_DEFAULT)
     level = models.IntegerField(choices=[(0, 0), (1, 1), (2, 2)])
     debt_to_the_supplier = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     date_of_creation = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    is_active = models.BooleanField(default=True)
+    deactivated_at = models.DateTimeField(null=True, blank=True)
+    chain_id = models.BigIntegerField(null=True, blank=True, editable=False)
+
+    objects = models.Manager()
+    active = ActiveNodeManager()
 
     def __str__(self) -> str:
         """
@@ -29,15 +80,180 @@ class Node(models.Model):
         verbose_name: str = 'trading network member'
         verbose_name_plural: str = 'trading network members'
         ordering: List[str] = ['level']
+        indexes: List[models.Index] = [
+            models.Index(fields=['level', 'id'], condition=models.Q(is_active=True), name='node_active_level'),
+            models.Index(fields=['chain_id', 'level', 'id'], name='node_chain_level'),
+        ]
+
+    @property
+    def chain_root_id(self) -> int:
+        """
+        Свойство chain_root_id возвращает первичный ключ завода в корне цепочки поставок участника сети.
+        """
+        return self.chain_id or self.pk
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Функция from_db переопределяет метод родительского класса. Запоминает загруженные значения полей
+        LOOKUP_FIELDS, чтобы при сохранении определить, перешел ли участник сети в другую цепочку
+        и изменились ли поля, хранящиеся в кэше node_cache.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance.remember_lookup_fields()
+        return instance
+
+    def remember_lookup_fields(self, fields: Optional[Iterable[str]] = None) -> None:
+        """
+        Функция remember_lookup_fields запоминает текущие значения полей LOOKUP_FIELDS (или только сохраненных
+        полей fields) как значения, записанные в базе данных. Отложенные поля не запоминаются.
+        """
+        loaded: Dict[str, Any] = getattr(self, "_loaded_values", {})
+        saved = LOOKUP_FIELDS if fields is None else set(LOOKUP_FIELDS) & {
+            self._meta.get_field(name).attname for name in fields}
+        self._loaded_values: Dict[str, Any] = {
+            **loaded, **{name: self.__dict__[name] for name in saved if name in self.__dict__}}
+
+    def lookup_fields_changed(self) -> bool:
+        """
+        Функция lookup_fields_changed возвращает True, если значение хотя бы одного из полей LOOKUP_FIELDS
+        отличается от загруженного из базы данных или записанного последним сохранением. Для поля,
+        значение которого не было загружено, изменение считается возможным.
+        """
+        loaded: Dict[str, Any] = getattr(self, "_loaded_values", {})
+        return any(name not in loaded or loaded[name] != self.__dict__[name]
+                   for name in LOOKUP_FIELDS if name in self.__dict__)
+
+    def deactivate(self) -> None:
+        """
+        Функция deactivate помечает участника сети неактивным вместо удаления. Связанные контакт, продукты
+        и покупатели не изменяются до переноса участника в архив.
+        """
+        self.is_active = False
+        self.deactivated_at = timezone.now()
+        self.save(update_fields=["is_active", "deactivated_at", "updated_at"])
 
     def save(self, *args, **kwargs):
         """
         Функция сохранения добавляет дополнительную функциональность методу родительского класса. Автоматически заполняет
-        поля при создании экземпляров класса. После этого она вызывает метод родительского класса.
+        ключ цепочки по поставщику, если участник сети новый или его поставщик изменился; иначе ключ цепочки
+        не перезаписывается, так как он мог измениться массовой операцией. После этого она вызывает метод
+        родительского класса. Если участник сети перешел в другую цепочку, переносит в нее своих покупателей
+        и продукты в той же транзакции. Внутри внешней транзакции точка сохранения не создается.
         """
-        if not self.id:
-            self.date_of_creation = datetime.now()
-        return super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        loaded: Dict[str, Any] = getattr(self, "_loaded_values", {})
+        if update_fields is None or "supplier" in update_fields:
+            if self._state.adding or loaded.get("supplier_id", -1) != self.supplier_id:
+                self.chain_id = self.supplier.chain_root_id if self.supplier_id else None
+                if update_fields is not None:
+                    kwargs["update_fields"] = {*update_fields, "chain_id"}
+            elif update_fields is None:
+                kwargs["update_fields"] = fields_except(self, "chain_id")
+
+        adding: bool = self._state.adding
+        loaded_root_id: Optional[int] = getattr(self, "_loaded_values", {}).get("chain_id") or self.pk
+        with transaction.atomic(using=kwargs.get("using"), savepoint=False):
+            result = super().save(*args, **kwargs)
+            if not adding and loaded_root_id != self.chain_root_id:
+                self.move_buyers_to_chain()
+        self.remember_lookup_fields(kwargs.get("update_fields"))
+        return result
+
+    def move_buyers_to_chain(self) -> None:
+        """
+        Функция move_buyers_to_chain записывает ключ цепочки участника сети его покупателям первого и второго
+        уровня и продуктам всех троих.
+        """
+        buyers = models.Q(supplier_id=self.pk) | models.Q(supplier__supplier_id=self.pk)
+        Node.objects.filter(buyers).update(chain_id=self.chain_root_id)
+        owners = models.Q(owner_id=self.pk) | models.Q(owner__supplier_id=self.pk) | models.Q(
+            owner__supplier__supplier_id=self.pk)
+        Product.objects.filter(owners).update(chain_id=self.chain_root_id)
+
+
+class Country(models.Model):
+    """
+    Класс Country наследуется от базового класса Model из модуля django.db.models.
+    Определяет поля таблицы-справочника стран. Поле key содержит нормализованное название и уникально.
+    """
+    name = models.CharField(max_length=50)
+    key = models.CharField(max_length=50, unique=True)
+
+    def __str__(self) -> str:
+        """
+        Функция __str__ переопределяет метод родительского класса Model и создает
+        выходной формат для экземпляров этого класса.
+        """
+        return self.name
+
+    class Meta:
+        """
+        Метакласс содержит общее имя экземпляра модели в единственном и множественном числе, используемое
+        в панели администрирования.
+        """
+        verbose_name: str = 'country'
+        verbose_name_plural: str = 'countries'
+        ordering: List[str] = ['name']
+
+
+class CityManager(models.Manager):
+    """
+    Класс CityManager наследуется от класса Manager из модуля django.db.models.
+    Добавляет поиск записи справочника городов по названиям страны и города в свободной форме.
+    """
+
+    def resolve(self, country: Optional[str], city: Optional[str]) -> Optional["City"]:
+        """
+        Функция resolve возвращает город из справочника, соответствующий названиям страны и города
+        без учета регистра и лишних пробелов, и создает записи справочников при их отсутствии.
+        Если город не указан, возвращается запись с пустым названием, обозначающая всю страну.
+        Возвращает None, если не указаны ни страна, ни город. Существующий город находится одним запросом.
+        """
+        if not location_key(country) and not location_key(city):
+            return None
+        city_obj: Optional[City] = self.filter(country__key=location_key(country), key=location_key(city)).first()
+        if city_obj is not None:
+            return city_obj
+        country_obj, _ = Country.objects.get_or_create(
+            key=location_key(country), defaults={"name": " ".join((country or "").split())}
+        )
+        city_obj, _ = self.get_or_create(
+            country=country_obj, key=location_key(city), defaults={"name": " ".join((city or "").split())}
+        )
+        return city_obj
+
+
+class City(models.Model):
+    """
+    Класс City наследуется от базового класса Model из модуля django.db.models.
+    Определяет поля таблицы-справочника городов, их свойства и ограничения.
+    Пара страна и нормализованное название уникальна.
+    """
+    country = models.ForeignKey(Country, on_delete=models.CASCADE, related_name="cities")
+    name = models.CharField(max_length=50)
+    key = models.CharField(max_length=50)
+
+    objects = CityManager()
+
+    def __str__(self) -> str:
+        """
+        Функция __str__ переопределяет метод родительского класса Model и создает
+        выходной формат для экземпляров этого класса.
+        """
+        return f"{self.name}, {self.country}" if self.name else str(self.country)
+
+    class Meta:
+        """
+        Метакласс содержит общее имя экземпляра модели в единственном и множественном числе, используемое
+        в панели администрирования.
+        """
+        verbose_name: str = 'city'
+        verbose_name_plural: str = 'cities'
+        ordering: List[str] = ['name']
+        constraints: List[models.BaseConstraint] = [
+            models.UniqueConstraint(fields=['country', 'key'], name='unique_city_in_country'),
+        ]
 
 
 class Contact(models.Model):
@@ -51,6 +267,8 @@ class Contact(models.Model):
     city = models.CharField(max_length=50, blank=True, null=True)
     street = models.CharField(max_length=50, blank=True, null=True)
     house_number = models.CharField(max_length=10, blank=True, null=True)
+    location = models.ForeignKey(City, null=True, blank=True, on_delete=models.SET_NULL, related_name="contacts")
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         """
@@ -60,6 +278,84 @@ class Contact(models.Model):
         verbose_name: str = 'contact'
         verbose_name_plural: str = 'contacts'
 
+    def save(self, *args, **kwargs):
+        """
+        Функция сохранения добавляет дополнительную функциональность методу родительского класса. Связывает контакт
+        с записью справочника городов, соответствующей указанным стране и городу. После этого она вызывает
+        метод родительского класса.
+        """
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or {"country", "city"} & set(update_fields):
+            self.location = City.objects.resolve(self.country, self.city)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "location"}
+        return super().save(*args, **kwargs)
+
+
+class ProductQuerySet(models.QuerySet):
+    """
+    Класс ProductQuerySet наследуется от класса QuerySet из модуля django.db.models.
+    Переопределяет массовые операции так, чтобы каждое изменение цены продукта записывалось в историю цен.
+    """
+
+    def update(self, **kwargs) -> int:
+        """
+        Функция update переопределяет метод базового класса. Если изменяется цена, обходит выбранные продукты
+        диапазонами первичных ключей по PRICE_HISTORY_BATCH_SIZE: для каждого диапазона читает прежние цены,
+        обновляет продукты и записывает в историю цены, которые действительно изменились, в отдельной короткой
+        транзакции. В памяти находятся цены только одного диапазона, блокировки строк снимаются после каждого.
+        """
+        if "selling_price" not in kwargs or self.query.is_sliced:
+            return super().update(**kwargs)
+
+        bounds: Dict[str, Optional[int]] = self.aggregate(first_id=models.Min("pk"), last_id=models.Max("pk"))
+        if bounds["first_id"] is None:
+            return 0
+        rows: int = 0
+        for start in range(bounds["first_id"] - 1, bounds["last_id"], PRICE_HISTORY_BATCH_SIZE):
+            with transaction.atomic(using=self.db):
+                chunk = self.filter(pk__gt=start, pk__lte=start + PRICE_HISTORY_BATCH_SIZE)
+                previous: Dict[int, Decimal] = dict(chunk.values_list("pk", "selling_price"))
+                if not previous:
+                    continue
+                rows += self.model._base_manager.using(self.db).filter(pk__in=list(previous)).update(**kwargs)
+                PriceHistory.record(list(previous), using=self.db, previous=previous)
+        return rows
+
+    def bulk_create(self, objs, *args, **kwargs) -> List["Product"]:
+        """
+        Функция bulk_create переопределяет метод базового класса. Заполняет ключ цепочки по владельцу, читая ключи
+        цепочек всех владельцев одним запросом, и записывает начальные цены созданных продуктов в историю цен.
+        """
+        objs = list(objs)
+        missing: List["Product"] = [obj for obj in objs if obj.chain_id is None]
+        if missing:
+            owners = Node.objects.using(self.db).filter(pk__in={obj.owner_id for obj in missing})
+            roots: Dict[int, Optional[int]] = dict(owners.values_list("pk", "chain_id"))
+            for obj in missing:
+                obj.chain_id = roots.get(obj.owner_id) or obj.owner_id
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            PriceHistory.objects.using(self.db).bulk_create(
+                [PriceHistory(product_id=obj.pk, price=obj.selling_price) for obj in objs if obj.pk is not None],
+                batch_size=PRICE_HISTORY_BATCH_SIZE,
+            )
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs) -> int:
+        """
+        Функция bulk_update переопределяет метод базового класса. Базовый метод обновляет продукты через
+        метод update, который записывает в историю цены, отличающиеся от прежних, поэтому здесь только
+        обновляется запомненная загруженная цена экземпляров.
+        """
+        objs = list(objs)
+        rows: int = super().bulk_update(objs, fields, *args, **kwargs)
+        if "selling_price" in fields:
+            field = self.model._meta.get_field("selling_price")
+            for obj in objs:
+                obj._loaded_price = field.to_python(obj.selling_price)
+        return rows
+
 
 class Product(models.Model):
     """
@@ -71,6 +367,10 @@ class Product(models.Model):
     release_date = models.DateField()
     owner = models.ForeignKey(Node, on_delete=models.CASCADE)
     selling_price = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    chain_id = models.BigIntegerField(null=True, blank=True, editable=False)
+
+    objects = ProductQuerySet.as_manager()
 
     def __str__(self) -> str:
         """
@@ -87,3 +387,184 @@ class Product(models.Model):
         verbose_name: str = 'product'
         verbose_name_plural: str = 'products'
         ordering: List[str] = ['name', 'model']
+        indexes: List[models.Index] = [
+            models.Index(fields=['chain_id', 'name', 'model'], name='product_chain_name'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Функция from_db переопределяет метод родительского класса. Запоминает загруженные из базы данных цену
+        и владельца, чтобы при сохранении определить, изменились ли они.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_price = instance.__dict__.get("selling_price")
+        instance._loaded_owner_id = instance.__dict__.get("owner_id")
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None) -> None:
+        """
+        Функция refresh_from_db переопределяет метод родительского класса. Вместе с ценой обновляет
+        запомненную загруженную цену, чтобы следующее сохранение не записало ее в историю повторно.
+        """
+        super().refresh_from_db(using=using, fields=fields)
+        if fields is None or "selling_price" in fields:
+            self._loaded_price = self.__dict__.get("selling_price")
+
+    def save(self, *args, **kwargs):
+        """
+        Функция сохранения добавляет дополнительную функциональность методу родительского класса. Заполняет ключ
+        цепочки по владельцу, если продукт новый или владелец изменился, вызывает метод родительского класса
+        и, если продукт новый или его цена изменилась, записывает цену в историю цен в той же транзакции.
+        Для существующего продукта цена сравнивается и с последней записью истории, так как она могла измениться
+        массовой операцией после загрузки экземпляра.
+        """
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "owner" in update_fields:
+            if self._state.adding or getattr(self, "_loaded_owner_id", None) != self.owner_id:
+                self.chain_id = self.owner.chain_root_id
+                if update_fields is not None:
+                    kwargs["update_fields"] = {*update_fields, "chain_id"}
+            elif update_fields is None:
+                kwargs["update_fields"] = fields_except(self, "chain_id")
+        price = self._meta.get_field("selling_price").to_python(self.selling_price)
+        price_changed: bool = (
+            self._state.adding or getattr(self, "_loaded_price", None) != price
+        ) and (update_fields is None or "selling_price" in update_fields)
+
+        adding: bool = self._state.adding
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+            if price_changed:
+                history = PriceHistory.objects.using(self._state.db)
+                last_price: Optional[Decimal] = None if adding else (
+                    history.filter(product=self).order_by("-changed_at").values_list("price", flat=True).first()
+                )
+                if adding or last_price != price:
+                    history.create(product=self, price=price)
+        self._loaded_price = price
+        if update_fields is None or "owner" in update_fields:
+            self._loaded_owner_id = self.owner_id
+
+
+class PriceHistory(models.Model):
+    """
+    Класс PriceHistory наследуется от базового класса Model из модуля django.db.models.
+    Определяет поля таблицы истории цен продуктов. Таблица только дополняется: запись создается при каждом
+    изменении цены и сохраняется после удаления продукта, поэтому внешний ключ не ограничен на уровне базы данных.
+    Составной индекс по продукту и времени обслуживает поиск цены на дату и временные ряды по продукту,
+    в PostgreSQL время изменения дополнительно индексируется BRIN-индексом.
+    """
+    product = models.ForeignKey(Product, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False,
+                                related_name="price_history")
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        """
+        Метакласс содержит общее имя экземпляра модели в единственном и множественном числе, используемое
+        в панели администрирования.
+        """
+        verbose_name: str = 'price history entry'
+        verbose_name_plural: str = 'price history'
+        indexes: List[models.Index] = [
+            models.Index(fields=['product', 'changed_at'], name='price_history_product_time'),
+        ]
+
+    @classmethod
+    def record(cls, product_ids: Iterable[int], using: Optional[str] = None,
+               previous: Optional[Dict[int, Decimal]] = None) -> None:
+        """
+        Функция record записывает в историю текущие цены продуктов с указанными первичными ключами
+        одним запросом на чтение и одним на вставку. Если передан словарь previous с прежними ценами,
+        записываются только цены, отличающиеся от прежних.
+        """
+        changed_at: datetime = timezone.now()
+        previous = previous or {}
+        prices = Product._base_manager.using(using).filter(pk__in=product_ids).values_list("pk", "selling_price")
+        cls.objects.using(using).bulk_create([
+            cls(product_id=pk, price=price, changed_at=changed_at) for pk, price in prices
+            if pk not in previous or previous[pk] != price
+        ])
+
+
+class ArchivedNode(models.Model):
+    """
+    Класс ArchivedNode наследуется от базового класса Model из модуля django.db.models.
+    Определяет поля архивной таблицы участников сети. Первичный ключ совпадает с первичным ключом
+    перенесенного участника, поставщик хранится как число без внешнего ключа.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    name = models.CharField(max_length=300)
+    supplier_id = models.BigIntegerField(null=True, blank=True)
+    level = models.IntegerField()
+    debt_to_the_supplier = models.DecimalField(max_digits=10, decimal_places=2)
+    date_of_creation = models.DateTimeField()
+    deactivated_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        """
+        Функция __str__ переопределяет метод родительского класса Model и создает
+        выходной формат для экземпляров этого класса.
+        """
+        return self.name
+
+    class Meta:
+        """
+        Метакласс содержит общее имя экземпляра модели в единственном и множественном числе, используемое
+        в панели администрирования.
+        """
+        verbose_name: str = 'archived trading network member'
+        verbose_name_plural: str = 'archived trading network members'
+
+
+class ArchivedContact(models.Model):
+    """
+    Класс ArchivedContact наследуется от базового класса Model из модуля django.db.models.
+    Определяет поля архивной таблицы контактов перенесенных в архив участников сети.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    member = models.OneToOneField(ArchivedNode, on_delete=models.CASCADE, related_name="contact")
+    email = models.EmailField(blank=True, null=True)
+    country = models.CharField(max_length=50, blank=True, null=True)
+    city = models.CharField(max_length=50, blank=True, null=True)
+    street = models.CharField(max_length=50, blank=True, null=True)
+    house_number = models.CharField(max_length=10, blank=True, null=True)
+
+    class Meta:
+        """
+        Метакласс содержит общее имя экземпляра модели в единственном и множественном числе, используемое
+        в панели администрирования.
+        """
+        verbose_name: str = 'archived contact'
+        verbose_name_plural: str = 'archived contacts'
+
+
+class ArchivedProduct(models.Model):
+    """
+    Класс ArchivedProduct наследуется от базового класса Model из модуля django.db.models.
+    Определяет поля архивной таблицы продуктов перенесенных в архив участников сети.
+    История цен продукта остается в таблице PriceHistory под тем же первичным ключом.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    owner = models.ForeignKey(ArchivedNode, on_delete=models.CASCADE, related_name="products")
+    name = models.CharField(max_length=150)
+    model = models.CharField(max_length=100)
+    release_date = models.DateField()
+    selling_price = models.DecimalField(max_digits=10, decimal_places=2)
+
+    def __str__(self) -> str:
+        """
+        Функция __str__ переопределяет метод родительского класса Model и создает
+        выходной формат для экземпляров этого класса.
+        """
+        return self.name
+
+    class Meta:
+        """
+        Метакласс содержит общее имя экземпляра модели в единственном и множественном числе, используемое
+        в панели администрирования.
+        """
+        verbose_name: str = 'archived product'
+        verbose_name_plural: str = 'archived products'
@@ -1,8 +1,36 @@
-from typing import Tuple, List, Dict
-from django.db import models
+from typing import Dict, List, Optional, Tuple
+from django.db import models, transaction
+from django.utils.encoding import smart_str
 from rest_framework import serializers
 
-from trade_network.models import Node, Contact
+from trade_network.cache import NodeRef, node_cache
+from trade_network.models import Node, Contact, Country, City, PriceHistory
+
+
+class NodeNameField(serializers.SlugRelatedField):
+    """
+    Класс NodeNameField наследуется от класса SlugRelatedField из rest_framework.serializers.
+    Представляет поставщика именем участника сети и разрешает имя через кэш node_cache, поэтому
+    запросы, ссылающиеся на часто используемых поставщиков, не обращаются к базе данных.
+    Принимаются только действующие участники сети.
+    """
+
+    def __init__(self, **kwargs) -> None:
+        kwargs.setdefault("slug_field", "name")
+        kwargs.setdefault("queryset", Node.active.all())
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data) -> Node:
+        """
+        Функция to_internal_value переопределяет метод базового класса. Возвращает экземпляр класса Node
+        с полями из кэша или вызывает ошибку проверки, если действующего участника с таким именем нет.
+        """
+        if not isinstance(data, str):
+            self.fail("invalid")
+        ref = node_cache.get(data)
+        if ref is None or not ref.is_active:
+            self.fail("does_not_exist", slug_name=self.slug_field, value=smart_str(data))
+        return ref.instance()
 
 
 class ContactSerializer(serializers.ModelSerializer):
@@ -18,7 +46,101 @@ class ContactSerializer(serializers.ModelSerializer):
         определяет необходимые параметры для функционирования сериализатора.
         """
         model: models.Model = Contact
-        fields: List[str] = ["email", "country", "city", "street", "house_number"]
+        fields: List[str] = ["email", "country", "city", "street", "house_number", "location"]
+        read_only_fields: Tuple[str, ...] = ("location",)
+
+
+class CountryStatsSerializer(serializers.ModelSerializer):
+    """
+    Класс CountryStatsSerializer наследуется от класса ModelSerializer из rest_framework.serializers.
+    Это класс для сериализации сводных показателей по стране: количества участников сети,
+    суммы их задолженности и количества их продуктов.
+    """
+    members = serializers.IntegerField(read_only=True)
+    debt = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
+    products = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        """
+        Метакласс - это внутренний служебный класс сериализатора,
+        определяет необходимые параметры для функционирования сериализатора.
+        """
+        model: models.Model = Country
+        fields: List[str] = ["id", "name", "members", "debt", "products"]
+
+
+class CityStatsSerializer(CountryStatsSerializer):
+    """
+    Класс CityStatsSerializer наследуется от класса CountryStatsSerializer.
+    Это класс для сериализации сводных показателей по городу.
+    """
+
+    class Meta:
+        """
+        Метакласс - это внутренний служебный класс сериализатора,
+        определяет необходимые параметры для функционирования сериализатора.
+        """
+        model: models.Model = City
+        fields: List[str] = ["id", "name", "country", "members", "debt", "products"]
+
+
+class PriceHistorySerializer(serializers.ModelSerializer):
+    """
+    Класс PriceHistorySerializer наследуется от класса ModelSerializer из rest_framework.serializers.
+    Это класс для сериализации записи истории цен продукта.
+    """
+
+    class Meta:
+        """
+        Метакласс - это внутренний служебный класс сериализатора,
+        определяет необходимые параметры для функционирования сериализатора.
+        """
+        model: models.Model = PriceHistory
+        fields: List[str] = ["product", "price", "changed_at"]
+
+
+class PriceAtQuerySerializer(serializers.Serializer):
+    """
+    Класс PriceAtQuerySerializer наследуется от класса Serializer из rest_framework.serializers.
+    Это класс для проверки параметров запроса цены продукта на момент времени.
+    """
+    at = serializers.DateTimeField(required=False)
+
+
+class PriceSeriesQuerySerializer(serializers.Serializer):
+    """
+    Класс PriceSeriesQuerySerializer наследуется от класса Serializer из rest_framework.serializers.
+    Это класс для проверки параметров запроса временного ряда цен: продукта, модели или владельца,
+    границ периода и интервала агрегации.
+    """
+    product = serializers.IntegerField(required=False)
+    model = serializers.CharField(required=False)
+    owner = serializers.IntegerField(required=False)
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+    interval = serializers.ChoiceField(choices=["hour", "day", "week", "month", "quarter", "year"], default="day")
+
+    def validate(self, attrs: dict) -> dict:
+        """
+        Функция validate переопределяет метод родительского класса. Требует указать хотя бы один из параметров
+        product, model или owner, чтобы запрос не читал историю цен всей сети.
+        """
+        if not {"product", "model", "owner"} & set(attrs):
+            raise serializers.ValidationError("One of 'product', 'model' or 'owner' is required")
+        return attrs
+
+
+class PriceSeriesSerializer(serializers.Serializer):
+    """
+    Класс PriceSeriesSerializer наследуется от класса Serializer из rest_framework.serializers.
+    Это класс для сериализации одной точки временного ряда цен: начала интервала, средней, минимальной
+    и максимальной цены и количества изменений цены за интервал.
+    """
+    period = serializers.DateTimeField()
+    avg = serializers.DecimalField(max_digits=10, decimal_places=2)
+    min = serializers.DecimalField(max_digits=10, decimal_places=2)
+    max = serializers.DecimalField(max_digits=10, decimal_places=2)
+    changes = serializers.IntegerField()
 
 
 class NodeCreateSerializer(serializers.ModelSerializer):
@@ -27,7 +149,7 @@ class NodeCreateSerializer(serializers.ModelSerializer):
     Это класс для удобной сериализации и десериализации объектов класса Node при
     обработке создания нового экземпляра класса Node.
     """
-    supplier = serializers.SlugRelatedField(required=False, queryset=Node.objects.all(), slug_field="name")
+    supplier = NodeNameField(required=False)
     contact = ContactSerializer(required=False)
 
     class Meta:
@@ -36,7 +158,8 @@ class NodeCreateSerializer(serializers.ModelSerializer):
         определяет необходимые параметры для функционирования сериализатора.
         """
         model: models.Model = Node
-        read_only_fields: Tuple[str, ...] = ("id", "debt_to_the_supplier", "date_of_creation")
+        read_only_fields: Tuple[str, ...] = ("id", "debt_to_the_supplier", "date_of_creation", "is_active",
+                                             "deactivated_at")
         fields: str = "__all__"
 
     def is_valid(self, *, raise_exception=False):
@@ -50,26 +173,27 @@ class NodeCreateSerializer(serializers.ModelSerializer):
         self.initial_data["level"] = level_detection(self.initial_data)
         return super().is_valid(raise_exception=raise_exception)
 
+    def validate(self, attrs: dict) -> dict:
+        """
+        Функция validate переопределяет метод базового класса. Проверяет данные контакта до записи в базу данных,
+        чтобы ошибка в них не прерывала создание участника сети после его сохранения.
+        """
+        contact = ContactSerializer(data=self._contact)
+        if not contact.is_valid():
+            raise serializers.ValidationError({"contact": contact.errors})
+        self._contact = contact.validated_data
+        return attrs
+
     def create(self, validated_data: dict) -> Node:
         """
         Функция create переопределяет метод базового класса. Она принимает в качестве аргументов экземпляр своего собственного класса
-        и полученные проверенные данные для создания нового экземпляра класса. Создает и сохраняет новый экземпляр
-        класса Node. Создает и сохраняет экземпляр связанного класса Contact.
+        и полученные проверенные данные для создания нового экземпляра класса. В одной транзакции создает
+        экземпляр класса Node и экземпляр связанного класса Contact, по одной вставке на каждый.
         Возвращает созданный экземпляр класса Node.
         """
-        node: Node = Node.objects.create(**validated_data)
-        node.save()
-
-        contact: Contact = Contact.objects.create(
-            memder=node,
-            email=self._contact.get("email", None),
-            country=self._contact.get("country", None),
-            city=self._contact.get("city", None),
-            street=self._contact.get("street", None),
-            house_number=self._contact.get("house_number", None)
-        )
-        contact.save()
-
+        with transaction.atomic():
+            node: Node = Node.objects.create(**validated_data)
+            node.contact = Contact.objects.create(member=node, **self._contact)
         return node
 
 
@@ -79,7 +203,7 @@ class NodeListSerializer(serializers.ModelSerializer):
     Это класс для удобной сериализации и десериализации объектов класса Node при
     обработке экземпляра использования класса Node.
     """
-    supplier = serializers.SlugRelatedField(queryset=Node.objects.all(), slug_field="name")
+    supplier = NodeNameField()
     contact = ContactSerializer()
 
     class Meta:
@@ -97,7 +221,7 @@ class NodeSerializer(serializers.ModelSerializer):
     Это класс для удобной сериализации и десериализации объектов класса Node при
     обработке экземпляра использования класса Node.
     """
-    supplier = serializers.SlugRelatedField(required=False, queryset=Node.objects.all(), slug_field="name")
+    supplier = NodeNameField(required=False)
     contact = ContactSerializer(required=False)
 
     class Meta:
@@ -107,7 +231,8 @@ class NodeSerializer(serializers.ModelSerializer):
         """
         model: models.Model = Node
         fields: str = "__all__"
-        read_only_fields: Tuple[str, ...] = ("id", "debt_to_the_supplier", "date_of_creation", "level")
+        read_only_fields: Tuple[str, ...] = ("id", "debt_to_the_supplier", "date_of_creation", "level",
+                                             "is_active", "deactivated_at")
 
     def is_valid(self, *, raise_exception=False):
         """
@@ -138,19 +263,25 @@ class NodeSerializer(serializers.ModelSerializer):
 def level_detection(kwargs: dict) -> int:
     """
     The level_detection function is a utility function. It takes as an argument data to create or update
-    an instance of the Node class. Specifies the hierarchical level of the location of an instance of the Node class.
+    an instance of the Node class. Specifies the hierarchical level of the location of an instance of the Node class
+    by walking the supplier chain through the node lookup cache. A supplier that is not a name, is unknown
+    or has a missing supplier of its own gives level 0 and is left to the supplier field validation.
     Returns the level as an integer.
     """
     level: int = 0
-    if kwargs["supplier"] is None:
+    if not isinstance(kwargs.get("supplier"), str):
         return level
 
-    supplier: Node = Node.objects.get(name=kwargs["supplier"])
+    supplier: Optional[NodeRef] = node_cache.get(kwargs["supplier"])
+    if supplier is None:
+        return level
 
     for i in range(2):
         level += 1
-        if supplier.supplier is None:
+        if supplier.supplier_id is None:
             return level
-        supplier = supplier.supplier
+        supplier = node_cache.get_by_id(supplier.supplier_id)
+        if supplier is None:
+            return 0
 
     raise Exception("Incorrect links in the hierarchical system")
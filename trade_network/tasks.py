@@ -0,0 +1,82 @@
+from typing import Any, Dict, List, Optional
+
+from django.db.models import Count, Max, Min, QuerySet
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.registry import register
+from trade_network import archive
+from trade_network.cache import node_cache
+from trade_network.models import Node
+
+BATCH_SIZE: int = 1000
+
+
+@register('trade_network.clear_debt')
+def clear_debt(job: Job, ids: Optional[List[int]] = None, filters: Optional[Dict[str, Any]] = None,
+               search: str = '') -> Dict[str, int]:
+    """
+    The clear_debt function is a background task. It resets debt_to_the_supplier of the nodes with the given ids,
+    or of the nodes matching the filter lookups and the admin search string, in batches, so each UPDATE holds
+    row locks only briefly, and reports progress after every batch. A filtered selection is walked in id ranges
+    of BATCH_SIZE and is never loaded into memory.
+    """
+    if ids is not None:
+        job.set_progress(0, total=len(ids))
+        updated: int = 0
+        for start in range(0, len(ids), BATCH_SIZE):
+            batch: List[int] = ids[start:start + BATCH_SIZE]
+            updated += Node.objects.filter(pk__in=batch).update(debt_to_the_supplier=0, updated_at=timezone.now())
+            job.set_progress(start + len(batch))
+        return {'updated': updated}
+
+    from django.contrib import admin
+
+    from trade_network.admin import NodeAdmin
+
+    queryset: QuerySet = Node.objects.filter(**(filters or {}))
+    if search:
+        queryset, _ = NodeAdmin(Node, admin.site).get_search_results(None, queryset, search)
+    bounds: Dict[str, Optional[int]] = queryset.aggregate(first_id=Min('id'), last_id=Max('id'), count=Count('id'))
+    job.set_progress(0, total=bounds['count'])
+    updated = 0
+    if bounds['count']:
+        for start in range(bounds['first_id'] - 1, bounds['last_id'], BATCH_SIZE):
+            updated += queryset.filter(id__gt=start, id__lte=start + BATCH_SIZE).update(
+                debt_to_the_supplier=0, updated_at=timezone.now())
+            job.set_progress(updated)
+    return {'updated': updated}
+
+
+@register('trade_network.relevel')
+def relevel(job: Job) -> Dict[str, int]:
+    """
+    The relevel function is a background task. It recomputes the stored level of every node from its supplier chain,
+    walking the table in id ranges of BATCH_SIZE. Nodes whose chain is longer than the allowed hierarchy
+    keep their level and are counted as skipped. The node lookup caches of all processes are invalidated afterwards.
+    """
+    last_id: int = Node.objects.aggregate(last_id=Max('id'))['last_id'] or 0
+    job.set_progress(0, total=last_id)
+    updated: int = 0
+    for start in range(0, last_id, BATCH_SIZE):
+        chunk = Node.objects.filter(id__gt=start, id__lte=start + BATCH_SIZE)
+        updated += chunk.filter(supplier__isnull=True).exclude(level=0).update(level=0, updated_at=timezone.now())
+        updated += chunk.filter(supplier__isnull=False, supplier__supplier__isnull=True).exclude(level=1).update(
+            level=1, updated_at=timezone.now())
+        updated += chunk.filter(supplier__supplier__isnull=False, supplier__supplier__supplier__isnull=True).exclude(
+            level=2).update(level=2, updated_at=timezone.now())
+        job.set_progress(min(start + BATCH_SIZE, last_id))
+    if updated:
+        node_cache.invalidate_all()
+    skipped: int = Node.objects.filter(supplier__supplier__supplier__isnull=False).count()
+    return {'updated': updated, 'skipped': skipped}
+
+
+@register('trade_network.archive_inactive')
+def archive_inactive(job: Job) -> Dict[str, int]:
+    """
+    The archive_inactive function is a background task. It moves inactive nodes with their contacts and products
+    to the archive tables in batches and reports the number of archived nodes as progress.
+    """
+    job.set_progress(0, total=Node.objects.filter(is_active=False).count())
+    return {'archived': archive.archive_inactive(progress=job.set_progress)}
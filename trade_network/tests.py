@@ -1,3 +1,614 @@
-from django.test import TestCase
+from decimal import Decimal
+from importlib import import_module
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.generics import ListAPIView
+from rest_framework.test import APIClient, APIRequestFactory
+
+from config.throttling import TokenBucketThrottle
+
+from trade_network.archive import archive_inactive
+from trade_network.cache import NodeLookupCache, NodeRef, node_cache
+from trade_network.integrity import check_range
+from trade_network.mixins import ConditionalGetMixin
+from trade_network.models import (ArchivedContact, ArchivedNode, ArchivedProduct, City, Contact, Country, Node,
+                                  PriceHistory, Product)
+from trade_network.serializers import NodeCreateSerializer, NodeListSerializer, NodeSerializer, level_detection
+from users.models import User
+
+
+class NodeCreateTestCase(TestCase):
+    """
+    Класс NodeCreateTestCase наследуется от класса TestCase из модуля django.test.
+    Проверяет количество запросов к базе данных при создании участника сети с контактом.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.supplier = Node.objects.create(name="Factory", level=0)
+        City.objects.resolve("Russia", "Moscow")
+
+    def setUp(self) -> None:
+        node_cache.clear()
+        node_cache.get("Factory")
+
+    def create(self, name: str, email: str = "member@example.com") -> NodeCreateSerializer:
+        serializer = NodeCreateSerializer(data={
+            "name": name,
+            "supplier": "Factory",
+            "contact": {"email": email, "country": "Russia", "city": "Moscow", "street": "Tverskaya",
+                        "house_number": "1"},
+        })
+        if serializer.is_valid():
+            serializer.save()
+        return serializer
+
+    def test_create_queries(self) -> None:
+        """
+        Проверка уникальности имени, точка сохранения и ее освобождение (внутри TestCase транзакция сериализатора
+        вложена в транзакцию теста; вне теста это начало и конец транзакции), вставка участника сети, поиск города
+        и вставка контакта.
+        """
+        with self.assertNumQueries(6):
+            serializer = self.create("Retail")
+        node: Node = serializer.instance
+        self.assertEqual((node.level, node.chain_id), (1, self.supplier.pk))
+        self.assertEqual(node.contact.location.name, "Moscow")
+
+    def test_activity_is_read_only(self) -> None:
+        """
+        Участник сети деактивируется только методом deactivate, а не через поля is_active и deactivated_at.
+        """
+        serializer = NodeCreateSerializer(data={"name": "Hidden", "is_active": False, "contact": {}})
+        self.assertTrue(serializer.is_valid())
+        self.assertTrue(serializer.save().is_active)
+
+        serializer = NodeSerializer(self.supplier, data={"is_active": False}, partial=True)
+        self.assertTrue(serializer.is_valid())
+        serializer.save()
+        self.supplier.refresh_from_db()
+        self.assertTrue(self.supplier.is_active)
+
+    def test_invalid_contact_writes_nothing(self) -> None:
+        serializer = self.create("Retail", email="not an email")
+        self.assertIn("contact", serializer.errors)
+        self.assertFalse(Node.objects.filter(name="Retail").exists())
+        self.assertFalse(Contact.objects.exists())
+
+
+    def test_invalid_supplier_is_field_error(self) -> None:
+        """
+        Поставщик, указанный не строкой, не ломает определение уровня, а отклоняется проверкой поля supplier.
+        """
+        serializer = NodeCreateSerializer(data={"name": "Retail", "supplier": ["Factory"], "contact": {}})
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("supplier", serializer.errors)
+        self.assertEqual(level_detection({"supplier": 1}), 0)
+
+    def test_missing_supplier_of_supplier(self) -> None:
+        retail: Node = Node.objects.create(name="Retail", level=1, supplier=self.supplier)
+        self.assertEqual(level_detection({"supplier": retail.name}), 2)
+        with mock.patch.object(node_cache, "get_by_id", return_value=None):
+            self.assertEqual(level_detection({"supplier": retail.name}), 0)
+
+class NodeLookupCacheTestCase(TestCase):
+    """
+    Класс NodeLookupCacheTestCase наследуется от класса TestCase из модуля django.test.
+    Проверяет экземпляры участников сети, которые строятся из записей кэша node_cache.
+    """
+
+    def test_instance_fields(self) -> None:
+        ref = NodeRef(id=7, name="Retail", level=1, supplier_id=42, is_active=True, chain_id=42)
+        node: Node = ref.instance()
+        self.assertEqual(
+            (node.pk, node.name, node.level, node.supplier_id, node.is_active, node.chain_id),
+            (7, "Retail", 1, 42, True, 42),
+        )
+        self.assertEqual(node.chain_root_id, 42)
+
+    def test_invalidate_all_reaches_other_processes(self) -> None:
+        """
+        Кэш другого процесса моделируется отдельным экземпляром NodeLookupCache с общим кэшем Django.
+        """
+        node: Node = Node.objects.create(name="Factory", level=0)
+        other = NodeLookupCache(max_size=10, ttl=60)
+        self.assertTrue(other.get("Factory").is_active)
+        Node.objects.filter(pk=node.pk).update(is_active=False)
+        self.assertTrue(other.get("Factory").is_active)
+        node_cache.invalidate_all()
+        self.assertFalse(other.get("Factory").is_active)
+
+    def test_save_invalidates_other_processes(self) -> None:
+        node: Node = Node.objects.create(name="Factory", level=0)
+        other = NodeLookupCache(max_size=10, ttl=60)
+        other.get("Factory")
+        node.deactivate()
+        self.assertFalse(other.get("Factory").is_active)
+
+
+    def test_save_of_other_fields_keeps_caches(self) -> None:
+        """
+        Изменение только контакта через NodeSerializer сохраняет участника сети целиком, но не сбрасывает кэши:
+        устаревшая запись другого процесса остается до переименования.
+        """
+        node: Node = Node.objects.create(name="Factory", level=0)
+        Contact.objects.create(member=node, email="factory@example.com")
+        other = NodeLookupCache(max_size=10, ttl=60)
+        other.get("Factory")
+        Node.objects.filter(pk=node.pk).update(is_active=False)
+
+        serializer = NodeSerializer(Node.objects.get(pk=node.pk), data={"contact": {"city": "Kazan"}}, partial=True)
+        self.assertTrue(serializer.is_valid())
+        serializer.save()
+        self.assertTrue(other.get("Factory").is_active)
+
+        node = Node.objects.get(pk=node.pk)
+        node.name = "Renamed factory"
+        node.save()
+        self.assertIsNone(other.get("Factory"))
+        self.assertFalse(other.get("Renamed factory").is_active)
+
+class PriceHistoryTestCase(TestCase):
+    """
+    Класс PriceHistoryTestCase наследуется от класса TestCase из модуля django.test.
+    Проверяет, что в историю цен записываются только действительные изменения цены.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.owner = Node.objects.create(name="Factory", level=0)
+
+    def create(self, name: str, price: str) -> Product:
+        return Product.objects.create(owner=self.owner, name=name, model="m", release_date="2024-01-01",
+                                      selling_price=Decimal(price))
+
+    def prices(self, product: Product) -> list:
+        return [str(price) for price in product.price_history.order_by("changed_at", "id").values_list("price", flat=True)]
+
+    def test_save_after_update_and_refresh(self) -> None:
+        product: Product = self.create("p", "10")
+        product.selling_price = Decimal("12")
+        product.save()
+        Product.objects.filter(pk=product.pk).update(selling_price=Decimal("15"))
+        product.refresh_from_db()
+        product.save()
+        self.assertEqual(self.prices(product), ["10.00", "12.00", "15.00"])
+
+    def test_save_of_stale_instance(self) -> None:
+        product: Product = self.create("p", "10")
+        Product.objects.filter(pk=product.pk).update(selling_price=Decimal("15"))
+        product.selling_price = Decimal("15")
+        product.save()
+        self.assertEqual(self.prices(product), ["10.00", "15.00"])
+
+    def test_bulk_operations_record_only_changes(self) -> None:
+        first: Product = self.create("a", "10")
+        second: Product = self.create("b", "20")
+        Product.objects.all().update(selling_price=Decimal("20"))
+        first.selling_price, second.selling_price = Decimal("30"), Decimal("20")
+        Product.objects.bulk_update([first, second], ["selling_price"])
+        self.assertEqual(self.prices(first), ["10.00", "20.00", "30.00"])
+        self.assertEqual(self.prices(second), ["20.00"])
+        self.assertEqual(PriceHistory.objects.count(), 4)
+
+
+    def test_update_in_batches(self) -> None:
+        """
+        Массовое изменение цены обходит продукты диапазонами первичных ключей, по транзакции на диапазон.
+        """
+        products = [self.create(str(number), "10") for number in range(5)]
+        Product.objects.filter(pk=products[0].pk).update(selling_price=Decimal("20"))
+        with mock.patch("trade_network.models.PRICE_HISTORY_BATCH_SIZE", 2):
+            with CaptureQueriesContext(connection) as context:
+                rows: int = Product.objects.filter(pk__in=[product.pk for product in products]).update(
+                    selling_price=Decimal("20"))
+        self.assertEqual(rows, 5)
+        self.assertEqual(sum(query["sql"].startswith("SAVEPOINT") for query in context), 3)
+        self.assertEqual(self.prices(products[0]), ["10.00", "20.00"])
+        self.assertEqual(self.prices(products[4]), ["10.00", "20.00"])
+        self.assertEqual(PriceHistory.objects.count(), 10)
+
+class ProductPriceTestCase(TestCase):
+    """
+    Класс ProductPriceTestCase наследуется от класса TestCase из модуля django.test.
+    Проверяет запрос цены продукта на момент времени.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create_user(username="member", password="secret")
+        owner: Node = Node.objects.create(name="Factory", level=0)
+        cls.product = Product.objects.create(owner=owner, name="p", model="m", release_date="2024-01-01",
+                                             selling_price=Decimal("10"))
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_current_price(self) -> None:
+        response = self.client.get(f"/trade_network/product/{self.product.pk}/price")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["price"], "10.00")
+
+    def test_invalid_pk_is_not_found(self) -> None:
+        self.assertEqual(self.client.get("/trade_network/product/abc/price").status_code, 404)
+        self.assertEqual(self.client.get("/trade_network/node/abc").status_code, 404)
+        self.assertEqual(self.client.get(f"/trade_network/product/{self.product.pk + 1}/price").status_code, 404)
+
+class ArchiveTestCase(TestCase):
+    """
+    Класс ArchiveTestCase наследуется от класса TestCase из модуля django.test.
+    Проверяет перенос неактивных участников сети в архив и исправление уровней и ключей цепочки их покупателей.
+    """
+
+    def test_buyers_start_own_chain(self) -> None:
+        """
+        Завод переносится в архив: розничная сеть становится заводом новой цепочки, ее покупатель - первым уровнем,
+        ключи цепочки продуктов обоих указывают на розничную сеть.
+        """
+        factory: Node = Node.objects.create(name="Factory", level=0)
+        retail: Node = Node.objects.create(name="Retail", level=1, supplier=factory)
+        entrepreneur: Node = Node.objects.create(name="Entrepreneur", level=2, supplier=retail)
+        Contact.objects.create(member=factory, email="factory@example.com")
+        products = {
+            node.name: Product.objects.create(owner=node, name=node.name, model="m", release_date="2024-01-01")
+            for node in (factory, retail, entrepreneur)
+        }
+        self.assertEqual(products["Entrepreneur"].chain_id, factory.pk)
+
+        factory.deactivate()
+        self.assertEqual(archive_inactive(batch_size=10), 1)
+
+        self.assertFalse(Node.objects.filter(pk=factory.pk).exists())
+        self.assertTrue(ArchivedNode.objects.filter(pk=factory.pk).exists())
+        self.assertEqual(ArchivedContact.objects.get().member_id, factory.pk)
+        self.assertEqual(ArchivedProduct.objects.get().pk, products["Factory"].pk)
+
+        retail.refresh_from_db()
+        entrepreneur.refresh_from_db()
+        self.assertEqual((retail.supplier_id, retail.level, retail.chain_id), (None, 0, None))
+        self.assertEqual((entrepreneur.supplier_id, entrepreneur.level, entrepreneur.chain_id),
+                         (retail.pk, 1, retail.pk))
+        self.assertEqual(set(Product.objects.values_list("chain_id", flat=True)), {retail.pk})
+
+
+class SupplyChainTestCase(TestCase):
+    """
+    Класс SupplyChainTestCase наследуется от класса TestCase из модуля django.test.
+    Проверяет перенос покупателей в цепочку поставщика и ограничение представлений цепочкой пользователя.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.factory = Node.objects.create(name="Factory", level=0)
+        cls.retail = Node.objects.create(name="Retail", level=1, supplier=cls.factory)
+        cls.entrepreneur = Node.objects.create(name="Entrepreneur", level=2, supplier=cls.retail)
+        cls.other = Node.objects.create(name="Other factory", level=0)
+        cls.other_retail = Node.objects.create(name="Other retail", level=1, supplier=cls.other)
+        for node in (cls.retail, cls.entrepreneur):
+            Product.objects.create(owner=node, name=node.name, model="m", release_date="2024-01-01")
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+
+    def list_names(self, user: User) -> set:
+        self.client.force_authenticate(user)
+        response = self.client.get("/trade_network/node/list")
+        self.assertEqual(response.status_code, 200)
+        return {node["name"] for node in response.json()["results"]}
+
+    def test_move_buyers_to_chain(self) -> None:
+        """
+        Розничная сеть переходит к другому заводу вместе со своим покупателем и продуктами обоих.
+        """
+        self.retail.supplier = self.other
+        self.retail.save()
+        self.assertEqual(
+            set(Node.objects.filter(pk__in=[self.retail.pk, self.entrepreneur.pk]).values_list("chain_id", flat=True)),
+            {self.other.pk},
+        )
+        self.assertEqual(set(Product.objects.values_list("chain_id", flat=True)), {self.other.pk})
+
+    def test_bulk_create_reads_owner_chains_once(self) -> None:
+        """
+        Ключи цепочек владельцев читаются одним запросом независимо от количества продуктов.
+        """
+        owners = (self.retail, self.entrepreneur, self.other_retail)
+        queries = []
+        for count in (3, 30):
+            products = [Product(owner_id=owners[number % 3].pk, name=f"bulk-{count}-{number}", model="m",
+                                release_date="2024-01-01") for number in range(count)]
+            with CaptureQueriesContext(connection) as context:
+                Product.objects.bulk_create(products)
+            queries.append(len(context))
+        self.assertEqual(queries[0], queries[1])
+        self.assertEqual(
+            dict(Product.objects.filter(name__startswith="bulk-3-").values_list("owner_id", "chain_id")),
+            {self.retail.pk: self.factory.pk, self.entrepreneur.pk: self.factory.pk,
+             self.other_retail.pk: self.other.pk},
+        )
+
+    def test_save_keeps_chain_without_owner_change(self) -> None:
+        """
+        Сохранение без смены поставщика или владельца не загружает его и не перезаписывает ключ цепочки,
+        измененный после загрузки экземпляра.
+        """
+        product: Product = Product.objects.get(owner=self.entrepreneur)
+        entrepreneur: Node = Node.objects.get(pk=self.entrepreneur.pk)
+        self.retail.supplier = self.other
+        self.retail.save()
+
+        with self.assertNumQueries(1):
+            entrepreneur.name = "Renamed entrepreneur"
+            entrepreneur.save()
+        with self.assertNumQueries(3):
+            product.name = "Renamed product"
+            product.save()
+        self.assertEqual(Node.objects.get(pk=self.entrepreneur.pk).chain_id, self.other.pk)
+        self.assertEqual(Product.objects.get(pk=product.pk).chain_id, self.other.pk)
+
+        product.owner = self.factory
+        product.save()
+        self.assertEqual(Product.objects.get(pk=product.pk).chain_id, self.factory.pk)
+        entrepreneur.supplier = self.factory
+        entrepreneur.save()
+        self.assertEqual(Node.objects.get(pk=self.entrepreneur.pk).chain_id, self.factory.pk)
+
+    @override_settings(TRADE_NETWORK_CHAIN_SCOPING=True)
+    def test_list_is_scoped_to_chain(self) -> None:
+        user: User = User.objects.create_user(username="member", password="secret", chain=self.factory)
+        self.assertEqual(self.list_names(user), {"Factory", "Retail", "Entrepreneur"})
+
+        staff: User = User.objects.create_user(username="staff", password="secret", is_staff=True)
+        self.assertEqual(len(self.list_names(staff)), 5)
+
+        orphan: User = User.objects.create_user(username="orphan", password="secret")
+        self.assertEqual(self.list_names(orphan), set())
+
+    @override_settings(TRADE_NETWORK_CHAIN_SCOPING=True)
+    def test_other_chain_is_hidden(self) -> None:
+        self.client.force_authenticate(User.objects.create_user(username="member", password="secret",
+                                                                chain=self.factory))
+        self.assertEqual(self.client.get(f"/trade_network/node/{self.retail.pk}").status_code, 200)
+        self.assertEqual(self.client.get(f"/trade_network/node/{self.other_retail.pk}").status_code, 404)
+        response = self.client.post("/trade_network/node", {"name": "Intruder", "supplier": "Other factory",
+                                                            "contact": {}}, format="json")
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Node.objects.filter(name="Intruder").exists())
+
+
+class IntegrityTestCase(TestCase):
+    """
+    Класс IntegrityTestCase наследуется от класса TestCase из модуля django.test.
+    Проверяет обнаружение и исправление нарушений целостности торговой сети функциями check_range и repair_issues.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.factory = Node.objects.create(name="Factory", level=0)
+        cls.retail = Node.objects.create(name="Retail", level=1, supplier=cls.factory)
+        cls.lonely = Node.objects.create(name="Lonely", level=0)
+        for node in (cls.factory, cls.retail):
+            Contact.objects.create(member=node, email=f"{node.pk}@example.com")
+        cls.product = Product.objects.create(owner=cls.retail, name="p", model="m", release_date="2024-01-01")
+        Node.objects.filter(pk=cls.retail.pk).update(level=2, chain_id=None, debt_to_the_supplier=Decimal("-1"))
+        Product.objects.filter(pk=cls.product.pk).update(chain_id=None)
+
+    def test_check_finds_issues(self) -> None:
+        result = check_range(0, self.lonely.pk)
+        self.assertEqual(result["checked"], 3)
+        self.assertEqual(result["issues"], {"level": 1, "chain": 1, "product_chain": 1, "contact": 1, "debt": 1})
+        self.assertEqual(result["samples"]["contact"], [self.lonely.pk])
+        self.assertEqual(result["repaired"], {})
+        self.assertEqual(Node.objects.get(pk=self.retail.pk).level, 2)
+
+    def test_repair(self) -> None:
+        """
+        Исправимые нарушения исправляются, отрицательная задолженность остается для ручного разбора.
+        """
+        result = check_range(0, self.lonely.pk, repair=True)
+        self.assertEqual(result["repaired"], {"level": 1, "chain": 1, "product_chain": 1, "contact": 1})
+
+        retail: Node = Node.objects.get(pk=self.retail.pk)
+        self.assertEqual((retail.level, retail.chain_id), (1, self.factory.pk))
+        self.assertEqual(Product.objects.get(pk=self.product.pk).chain_id, self.factory.pk)
+        lonely: Node = Node.objects.get(pk=self.lonely.pk)
+        self.assertFalse(lonely.is_active)
+        self.assertIsNotNone(lonely.deactivated_at)
+
+        self.assertEqual(check_range(0, self.lonely.pk)["issues"], {"debt": 1})
+
+
+@override_settings(SLOW_QUERY_SAMPLE_RATE=0)
+class ConditionalGetTestCase(TestCase):
+    """
+    Класс ConditionalGetTestCase наследуется от класса TestCase из модуля django.test.
+    Проверяет ответ 304 Not Modified на условные запросы списка и участника сети.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create_user(username="member", password="secret")
+        cls.factory = Node.objects.create(name="Factory", level=0)
+        Contact.objects.create(member=cls.factory, email="factory@example.com")
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_not_modified(self) -> None:
+        """
+        Ответ 304 определяется одним агрегирующим запросом, без загрузки участников сети.
+        """
+        response = self.client.get("/trade_network/node/list")
+        self.assertEqual(response.status_code, 200)
+        etag: str = response["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get("/trade_network/node/list", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertFalse(response.content)
+
+        self.factory.name = "Renamed factory"
+        self.factory.save()
+        response = self.client.get("/trade_network/node/list", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_node_not_modified(self) -> None:
+        url: str = f"/trade_network/node/{self.factory.pk}"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]).status_code, 304)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH='"other"').status_code, 200)
+
+
+    def test_view_without_version_stamp(self) -> None:
+        """
+        Представление, не определившее get_version_stamp, отвечает обычным образом, без ETag.
+        """
+        class PlainListView(ConditionalGetMixin, ListAPIView):
+            queryset = Node.objects.all()
+            serializer_class = NodeListSerializer
+
+        request = APIRequestFactory().get("/plain", HTTP_IF_NONE_MATCH="*")
+        response = PlainListView.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+
+@mock.patch.object(TokenBucketThrottle, "THROTTLE_RATES", {"trade_network": "10/min"})
+class ThrottlingTestCase(TestCase):
+    """
+    Класс ThrottlingTestCase наследуется от класса TestCase из модуля django.test.
+    Проверяет ответ 429 Too Many Requests при исчерпании корзины токенов.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create_user(username="member", password="secret")
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_unfiltered_list_exhausts_bucket(self) -> None:
+        """
+        Список без фильтров стоит 5 токенов из 10: третий запрос отклоняется, повторить его можно через время
+        накопления 5 токенов.
+        """
+        for _ in range(2):
+            self.assertEqual(self.client.get("/trade_network/node/list").status_code, 200)
+        response = self.client.get("/trade_network/node/list")
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "30")
+
+    def test_id_in_is_filtered_request(self) -> None:
+        """
+        Список с параметром id__in возвращает только указанных участников сети и стоит 1 токен,
+        как отфильтрованный запрос: отклоняется только одиннадцатый запрос.
+        """
+        nodes = [Node.objects.create(name=name, level=0) for name in ("Factory", "Retail", "Shop")]
+        query: str = f"id__in={nodes[0].pk},{nodes[2].pk}"
+        for _ in range(10):
+            response = self.client.get(f"/trade_network/node/list?{query}")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual({node["name"] for node in response.json()["results"]}, {"Factory", "Shop"})
+        self.assertEqual(self.client.get(f"/trade_network/node/list?{query}").status_code, 429)
+
+    def test_locked_bucket_is_throttled(self) -> None:
+        """
+        Если блокировку корзины удерживает другой запрос дольше lock_attempts попыток, запрос отклоняется.
+        """
+        cache.add(f"throttle_bucket_trade_network_{self.user.pk}_lock", 1)
+        with mock.patch.object(TokenBucketThrottle, "lock_attempts", 2):
+            self.assertEqual(self.client.get("/trade_network/node/list?id__in=1").status_code, 429)
+
+
+class LocationTestCase(TestCase):
+    """
+    Класс LocationTestCase наследуется от класса TestCase из модуля django.test.
+    Проверяет нормализацию названий стран и городов, перенос существующих контактов в справочники
+    и сводные показатели по странам и городам.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create_user(username="user", password="user")
+        members = [
+            ("Factory", "Russia", "Moscow", "100.00", 3, True),
+            ("Retail", "russia ", " MOSCOW", "50.00", 0, True),
+            ("Shop", "Russia", "Saint  Petersburg", "25.00", 1, True),
+            ("Closed", "Russia", "Moscow", "1000.00", 2, False),
+            ("Market", "Germany", "Berlin", "7.00", 0, True),
+        ]
+        for name, country, city, debt, products, is_active in members:
+            node: Node = Node.objects.create(name=name, level=0, debt_to_the_supplier=Decimal(debt),
+                                             is_active=is_active)
+            Contact.objects.create(member=node, country=country, city=city)
+            for number in range(products):
+                Product.objects.create(owner=node, name=f"{name} {number}", model="m", release_date="2024-01-01")
+        cls.russia = Country.objects.get(key="russia")
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_resolve_normalizes_names(self) -> None:
+        """
+        Названия, отличающиеся регистром и пробелами, соответствуют одной записи справочника;
+        существующий город находится одним запросом.
+        """
+        with self.assertNumQueries(1):
+            city: City = City.objects.resolve("  RUSSIA", "moscow  ")
+        self.assertEqual((city.name, city.country.name), ("Moscow", "Russia"))
+        self.assertEqual(Country.objects.filter(key="russia").count(), 1)
+        self.assertEqual(City.objects.filter(country=self.russia).count(), 2)
+        self.assertEqual(City.objects.get(key="saint petersburg").name, "Saint Petersburg")
+        self.assertIsNone(City.objects.resolve(" ", None))
+        self.assertEqual(City.objects.resolve("Germany", "").key, "")
+
+    def test_migration_deduplicates_locations(self) -> None:
+        """
+        Функция миграции 0003_location создает по одной записи на нормализованные страну и город
+        и связывает с ними все контакты.
+        """
+        migration = import_module("trade_network.migrations.0003_location")
+        Contact.objects.update(location=None)
+        City.objects.all().delete()
+        Country.objects.all().delete()
+        migration.link_contacts_to_locations(apps, None)
+        self.assertEqual(sorted(Country.objects.values_list("key", flat=True)), ["germany", "russia"])
+        self.assertEqual(sorted(City.objects.values_list("key", flat=True)), ["berlin", "moscow", "saint petersburg"])
+        self.assertFalse(Contact.objects.filter(location=None).exists())
+        moscow: City = City.objects.get(key="moscow")
+        self.assertEqual(set(moscow.contacts.values_list("member__name", flat=True)), {"Factory", "Retail", "Closed"})
+
+    def test_country_stats(self) -> None:
+        """
+        Продукты считаются подзапросом, поэтому соединение с ними не умножает сумму задолженности;
+        неактивные участники сети не учитываются.
+        """
+        response = self.client.get("/trade_network/location/countries")
+        self.assertEqual(response.status_code, 200)
+        stats = {row["name"]: (row["members"], row["debt"], row["products"]) for row in response.json()["results"]}
+        self.assertEqual(stats, {"Russia": (3, "175.00", 4), "Germany": (1, "7.00", 0)})
+
+    def test_city_stats_filtered_by_country(self) -> None:
+        response = self.client.get("/trade_network/location/cities", {"country": self.russia.pk})
+        self.assertEqual(response.status_code, 200)
+        stats = {row["name"]: (row["country"], row["members"], row["debt"], row["products"])
+                 for row in response.json()["results"]}
+        self.assertEqual(stats, {"Moscow": (self.russia.pk, 2, "150.00", 3),
+                                 "Saint Petersburg": (self.russia.pk, 1, "25.00", 1)})
@@ -5,5 +5,9 @@ from trade_network import views
 urlpatterns = [
     path("node", views.NodeCreateView.as_view()),
     path("node/list", views.NodeListView.as_view()),
-    path("node/<pk>", views.NodeView.as_view()),
+    path("node/<int:pk>", views.NodeView.as_view()),
+    path("location/countries", views.CountryStatsView.as_view()),
+    path("location/cities", views.CityStatsView.as_view()),
+    path("product/price_history", views.PriceSeriesView.as_view()),
+    path("product/<int:pk>/price", views.ProductPriceView.as_view()),
 ]
@@ -1,44 +1,290 @@
-from typing import List
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 
 from django.db import models
+from django.db.models import (Avg, Count, DecimalField, IntegerField, Max, Min, OuterRef, Q, QuerySet, Subquery,
+                              Sum, Value)
+from django.db.models.functions import Coalesce, Trunc
+from django.http import Http404
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import permissions, serializers
-from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveUpdateDestroyAPIView
+from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveAPIView, RetrieveUpdateDestroyAPIView
+from rest_framework.schemas.openapi import AutoSchema
 
-from trade_network.models import Node
-from trade_network.serializers import NodeCreateSerializer, NodeListSerializer, NodeSerializer
+from config.generics import LazySerializerMixin
+from config.schema import QueryParametersSchema
+from trade_network.mixins import ChainScopedMixin, ConditionalGetMixin
+from trade_network.models import City, Country, Node, PriceHistory, Product
 
 
-class NodeCreateView(CreateAPIView):
+class NodeCreateView(LazySerializerMixin, ChainScopedMixin, CreateAPIView):
     """
     Класс NodeCreateView наследуется от класса CreateAPIView из модуля rest_framework.generics
     и представляет собой представление на основе класса для обработки запросов методами POST по адресу '/trade_network/node'.
     """
     model: models.Model = Node
     permission_classes: list = [permissions.IsAuthenticated]
-    serializer_class: serializers.ModelSerializer = NodeCreateSerializer
+    serializer_class: str = 'trade_network.serializers.NodeCreateSerializer'
+    throttle_scope: str = 'trade_network'
+    schema: AutoSchema = AutoSchema(operation_id_base='Node')
 
+    def perform_create(self, serializer: serializers.ModelSerializer) -> None:
+        """
+        Функция perform_create переопределяет метод родительского класса. Пользователь, ограниченный цепочкой
+        поставок, может добавлять участников сети только к поставщикам своей цепочки.
+        """
+        self.check_supplier_chain(serializer.validated_data.get("supplier"))
+        serializer.save()
 
-class NodeListView(ListAPIView):
+
+class NodeListView(LazySerializerMixin, ChainScopedMixin, ConditionalGetMixin, ListAPIView):
     """
     Класс NodeListView наследуется от класса ListAPIView из модуля rest_framework.generics
     и представляет собой представление на основе класса для обработки запросов с помощью методов GET по адресу '/trade_network/node/list'.
+    Параметр id__in (список первичных ключей через запятую) позволяет получить нескольких участников сети
+    одним запросом вместо запросов к '/trade_network/node/<pk>' для каждого.
     """
     model: models.Model = Node
-    queryset: List[Node] = Node.objects.all()
+    queryset: List[Node] = Node.active.all()
     permission_classes: list = [permissions.IsAuthenticated]
-    serializer_class: serializers.ModelSerializer = NodeListSerializer
+    serializer_class: str = 'trade_network.serializers.NodeListSerializer'
     filter_backends: list = [DjangoFilterBackend, ]
-    filterset_fields: List[str] = ["contact__country", ]
+    filterset_fields: Dict[str, List[str]] = {
+        "id": ["in"],
+        "contact__country": ["exact"],
+        "contact__location": ["exact"],
+        "contact__location__country": ["exact"],
+    }
+    throttle_scope: str = 'trade_network'
+    chain_root_lookup: Optional[str] = 'pk'
+    throttle_cost: int = 1
+    unfiltered_throttle_cost: int = 5
+
+    def get_throttle_cost(self, request) -> int:
+        """
+        Функция get_throttle_cost определяет стоимость запроса для ограничения частоты запросов.
+        Запрос без фильтров стоит unfiltered_throttle_cost токенов, отфильтрованный - throttle_cost.
+        Стоимость умножается на количество стандартных страниц, запрошенных параметром limit.
+        """
+        filtered: bool = any(
+            request.query_params.get(field if lookup == "exact" else f"{field}__{lookup}")
+            for field, lookups in self.filterset_fields.items() for lookup in lookups
+        )
+        cost: int = self.throttle_cost if filtered else self.unfiltered_throttle_cost
+        page_size: int = self.paginator.default_limit
+        pages: int = -(-(self.paginator.get_limit(request) or page_size) // page_size)
+        return cost * pages
+
+    def get_version_stamp(self) -> Tuple[Optional[Dict[str, Any]], Optional[datetime]]:
+        """
+        Функция get_version_stamp переопределяет метод класса ConditionalGetMixin. Возвращает агрегат
+        по отфильтрованному списку, вычисляемый одним запросом. Заголовок Last-Modified для списка не используется,
+        так как удаление записей не меняет время последнего изменения.
+        """
+        return node_version_stamp(self.filter_queryset(self.get_queryset())), None
 
 
-class NodeView(RetrieveUpdateDestroyAPIView):
+class NodeView(LazySerializerMixin, ChainScopedMixin, ConditionalGetMixin, RetrieveUpdateDestroyAPIView):
     """
     Класс NodeView наследуется от класса RetrieveUpdateDestroyAPIView из модуля rest_framework.generics
     и представляет собой представление на основе класса для обработки запросов с помощью методов GET, PUT, PATCH и DELETE по адресу
     /trade_network/node/<pk>'.
     """
     model: models.Model = Node
-    queryset: List[Node] = Node.objects.all()
-    serializer_class: serializers.ModelSerializer = NodeSerializer
+    queryset: List[Node] = Node.active.all()
+    serializer_class: str = 'trade_network.serializers.NodeSerializer'
+    permission_classes: list = [permissions.IsAuthenticated, ]
+    throttle_scope: str = 'trade_network'
+    chain_root_lookup: Optional[str] = 'pk'
+
+    def get_version_stamp(self) -> Tuple[Optional[Dict[str, Any]], Optional[datetime]]:
+        """
+        Функция get_version_stamp переопределяет метод класса ConditionalGetMixin. Возвращает агрегат по
+        запрошенному участнику сети, его контакту и поставщику, а также время последнего изменения любого из них.
+        """
+        stamp: Dict[str, Any] = node_version_stamp(self.get_queryset().filter(pk=self.kwargs["pk"]))
+        if not stamp["count"]:
+            return None, None
+        return stamp, max(value for key, value in stamp.items() if key != "count" and value is not None)
+
+    def perform_update(self, serializer: serializers.ModelSerializer) -> None:
+        """
+        Функция perform_update переопределяет метод родительского класса. Пользователь, ограниченный цепочкой
+        поставок, не может перенести участника сети в другую цепочку.
+        """
+        if "supplier" in serializer.validated_data:
+            self.check_supplier_chain(serializer.validated_data["supplier"])
+        serializer.save()
+
+    def perform_destroy(self, instance: Node) -> None:
+        """
+        Функция perform_destroy переопределяет метод родительского класса. Вместо каскадного удаления помечает
+        участника сети неактивным. Перенос в архив и отвязка покупателей выполняются позже пакетами
+        командой archive_nodes или фоновой задачей trade_network.archive_inactive.
+        """
+        instance.deactivate()
+
+
+class CountryStatsView(LazySerializerMixin, ChainScopedMixin, ListAPIView):
+    """
+    Класс CountryStatsView наследуется от класса ListAPIView из модуля rest_framework.generics
+    и представляет собой представление на основе класса для обработки запросов с помощью методов GET
+    по адресу '/trade_network/location/countries'. Возвращает для каждой страны количество участников сети,
+    сумму их задолженности и количество продуктов, вычисленные одним запросом по индексам справочника.
+    """
+    model: models.Model = Country
     permission_classes: list = [permissions.IsAuthenticated, ]
+    serializer_class: str = 'trade_network.serializers.CountryStatsSerializer'
+    throttle_scope: str = 'trade_network'
+
+    def get_queryset(self) -> QuerySet:
+        """
+        Функция get_queryset переопределяет метод родительского класса. Возвращает страны с аннотированными
+        сводными показателями.
+        """
+        return location_stats(Country.objects.all(), "cities__contacts", "owner__contact__location__country",
+                              self.get_chain_root_id())
+
+
+class CityStatsView(LazySerializerMixin, ChainScopedMixin, ListAPIView):
+    """
+    Класс CityStatsView наследуется от класса ListAPIView из модуля rest_framework.generics
+    и представляет собой представление на основе класса для обработки запросов с помощью методов GET
+    по адресу '/trade_network/location/cities'. Возвращает сводные показатели по городам,
+    список можно отфильтровать по стране параметром country.
+    """
+    model: models.Model = City
+    permission_classes: list = [permissions.IsAuthenticated, ]
+    serializer_class: str = 'trade_network.serializers.CityStatsSerializer'
+    filter_backends: list = [DjangoFilterBackend, ]
+    filterset_fields: List[str] = ["country", ]
+    throttle_scope: str = 'trade_network'
+
+    def get_queryset(self) -> QuerySet:
+        """
+        Функция get_queryset переопределяет метод родительского класса. Возвращает города с аннотированными
+        сводными показателями.
+        """
+        return location_stats(City.objects.all(), "contacts", "owner__contact__location", self.get_chain_root_id())
+
+
+class ProductPriceView(LazySerializerMixin, ChainScopedMixin, RetrieveAPIView):
+    """
+    Класс ProductPriceView наследуется от класса RetrieveAPIView из модуля rest_framework.generics
+    и представляет собой представление на основе класса для обработки запросов с помощью методов GET
+    по адресу '/trade_network/product/<pk>/price'. Возвращает цену продукта, действовавшую в момент,
+    указанный параметром at (по умолчанию - текущую цену).
+    """
+    model: models.Model = PriceHistory
+    queryset: List[PriceHistory] = PriceHistory.objects.all()
+    permission_classes: list = [permissions.IsAuthenticated, ]
+    serializer_class: str = 'trade_network.serializers.PriceHistorySerializer'
+    throttle_scope: str = 'trade_network'
+    chain_lookup: str = 'product__chain_id'
+    schema: AutoSchema = QueryParametersSchema('trade_network.serializers.PriceAtQuerySerializer',
+                                               operation_id_base='ProductPrice')
+
+    def get_object(self) -> PriceHistory:
+        """
+        Функция get_object переопределяет метод родительского класса. Возвращает последнюю запись истории цен
+        продукта не позже указанного момента, используя составной индекс по продукту и времени.
+        """
+        from trade_network.serializers import PriceAtQuerySerializer
+
+        query = PriceAtQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        entry = (
+            self.get_queryset()
+            .filter(product_id=self.kwargs["pk"], changed_at__lte=query.validated_data.get("at", timezone.now()))
+            .order_by("-changed_at")
+            .first()
+        )
+        if entry is None:
+            raise Http404
+        return entry
+
+
+class PriceSeriesView(LazySerializerMixin, ChainScopedMixin, ListAPIView):
+    """
+    Класс PriceSeriesView наследуется от класса ListAPIView из модуля rest_framework.generics
+    и представляет собой представление на основе класса для обработки запросов с помощью методов GET
+    по адресу '/trade_network/product/price_history'. Возвращает временной ряд цен продукта, модели
+    или продуктов владельца, агрегированный по интервалам.
+    """
+    model: models.Model = PriceHistory
+    queryset: List[PriceHistory] = PriceHistory.objects.all()
+    permission_classes: list = [permissions.IsAuthenticated, ]
+    serializer_class: str = 'trade_network.serializers.PriceSeriesSerializer'
+    throttle_scope: str = 'trade_network'
+    chain_lookup: str = 'product__chain_id'
+    schema: AutoSchema = QueryParametersSchema('trade_network.serializers.PriceSeriesQuerySerializer',
+                                               operation_id_base='PriceSeries')
+
+    def get_queryset(self) -> QuerySet:
+        """
+        Функция get_queryset переопределяет метод родительского класса. Проверяет параметры запроса и возвращает
+        записи истории цен, сгруппированные по началу интервала, одним запросом с агрегатами.
+        """
+        from trade_network.serializers import PriceSeriesQuerySerializer
+
+        query = PriceSeriesQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        params: Dict[str, Any] = query.validated_data
+
+        history: QuerySet = super().get_queryset()
+        for param, lookup in (("product", "product_id"), ("model", "product__model"), ("owner", "product__owner_id"),
+                              ("start", "changed_at__gte"), ("end", "changed_at__lt")):
+            if param in params:
+                history = history.filter(**{lookup: params[param]})
+
+        return (
+            history
+            .annotate(period=Trunc("changed_at", params["interval"]))
+            .values("period")
+            .annotate(avg=Avg("price"), min=Min("price"), max=Max("price"), changes=Count("id"))
+            .order_by("period")
+        )
+
+
+def location_stats(queryset: QuerySet, contacts: str, product_location: str,
+                   root_id: Optional[int] = None) -> QuerySet:
+    """
+    The location_stats function is a utility function. It annotates a queryset of locations with the number
+    of active network members, the sum of their debts and the number of their products. Products are counted
+    in a correlated subquery, so joining them does not multiply the debt sum. If root_id is given,
+    only the members and products of that supply chain are counted.
+    """
+    owned: QuerySet = Product.objects.filter(**{product_location: OuterRef("pk")}, owner__is_active=True)
+    active: Q = Q(**{f"{contacts}__member__is_active": True})
+    if root_id is not None:
+        owned = owned.filter(chain_id=root_id)
+        active &= Q(**{f"{contacts}__member__chain_id": root_id}) | Q(**{f"{contacts}__member__pk": root_id})
+    products: Subquery = Subquery(
+        owned
+        .order_by()
+        .values(product_location)
+        .annotate(count=Count("id"))
+        .values("count"),
+        output_field=IntegerField(),
+    )
+    return queryset.annotate(
+        members=Count(contacts, filter=active),
+        debt=Coalesce(Sum(f"{contacts}__member__debt_to_the_supplier", filter=active), Value(0),
+                      output_field=DecimalField()),
+        products=Coalesce(products, Value(0)),
+    )
+
+
+def node_version_stamp(queryset: QuerySet) -> Dict[str, Any]:
+    """
+    The node_version_stamp function is a utility function. It takes a queryset of Node instances and returns,
+    in a single aggregate query, the number of instances and the latest modification time of the instances,
+    their contacts and their suppliers - everything the node serializers output depends on.
+    """
+    return queryset.aggregate(
+        count=Count("id"),
+        node=Max("updated_at"),
+        contact=Max("contact__updated_at"),
+        supplier=Max("supplier__updated_at"),
+    )
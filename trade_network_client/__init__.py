@@ -0,0 +1,8 @@
+"""
+Клиент API торговой сети. Зависит только от пакета requests (и msgpack для ответов в формате MessagePack)
+и не импортирует Django, поэтому каталог можно скопировать в проект интеграции или добавить в PYTHONPATH.
+"""
+from trade_network_client.client import (ApiError, Contact, LocationStats, Node, PriceHistory, PricePoint,
+                                         TradeNetworkClient)
+
+__all__ = ['ApiError', 'Contact', 'LocationStats', 'Node', 'PriceHistory', 'PricePoint', 'TradeNetworkClient']
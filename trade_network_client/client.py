@@ -0,0 +1,234 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TypedDict, Union
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+MSGPACK_MEDIA_TYPE: str = 'application/msgpack'
+
+
+class Contact(TypedDict, total=False):
+    email: Optional[str]
+    country: Optional[str]
+    city: Optional[str]
+    street: Optional[str]
+    house_number: Optional[str]
+    location: Optional[int]
+
+
+class Node(TypedDict, total=False):
+    id: int
+    name: str
+    level: int
+    supplier: Optional[str]
+    debt_to_the_supplier: str
+    contact: Contact
+
+
+class LocationStats(TypedDict, total=False):
+    id: int
+    name: str
+    country: int
+    members: int
+    debt: str
+    products: int
+
+
+class PriceHistory(TypedDict):
+    product: int
+    price: str
+    changed_at: Union[str, datetime]
+
+
+class PricePoint(TypedDict):
+    period: Union[str, datetime]
+    avg: str
+    min: str
+    max: str
+    changes: int
+
+
+class ApiError(Exception):
+    """
+    Класс ApiError наследуется от класса Exception. Вызывается при ответе API с кодом ошибки,
+    содержит код ответа и разобранное тело ответа.
+    """
+
+    def __init__(self, status: int, detail: Any) -> None:
+        super().__init__(f'{status}: {detail}')
+        self.status: int = status
+        self.detail: Any = detail
+
+
+class TradeNetworkClient:
+    """
+    Класс TradeNetworkClient - клиент API торговой сети. Использует одну сессию requests с пулом соединений,
+    поэтому запросы переиспользуют TCP и TLS соединения. Повторяет идемпотентные запросы при ответах 429 и 5xx
+    с учетом заголовка Retry-After. Списки читаются постранично по ссылкам next страницами по page_size записей,
+    участники сети по первичным ключам запрашиваются пакетами по batch_size через фильтр id__in.
+    С параметром msgpack=True ответы запрашиваются в формате MessagePack (нужен пакет msgpack), дата и время
+    в них возвращаются объектами datetime, а не строками.
+    """
+
+    def __init__(self, base_url: str, username: Optional[str] = None, password: Optional[str] = None, *,
+                 msgpack: bool = False, page_size: int = 500, batch_size: int = 100, timeout: float = 30.0,
+                 retries: int = 3, pool_size: int = 10, session: Optional[requests.Session] = None) -> None:
+        self.base_url: str = base_url.rstrip('/') + '/'
+        self.page_size: int = page_size
+        self.batch_size: int = batch_size
+        self.timeout: float = timeout
+        self.session: requests.Session = session or requests.Session()
+        if username is not None:
+            self.session.auth = (username, password or '')
+
+        retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 502, 503, 504),
+                      respect_retry_after_header=True, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._unpackb = None
+        if msgpack:
+            import msgpack as msgpack_module
+
+            self._unpackb = msgpack_module.unpackb
+            self.session.headers['Accept'] = MSGPACK_MEDIA_TYPE
+        else:
+            self.session.headers['Accept'] = 'application/json'
+
+    def __enter__(self) -> 'TradeNetworkClient':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Функция close закрывает соединения сессии.
+        """
+        self.session.close()
+
+    def request(self, method: str, path: str, params: Optional[Dict[str, Any]] = None,
+                json: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Функция request выполняет запрос к API по пути относительно base_url или по абсолютной ссылке
+        и возвращает разобранное тело ответа. При коде ответа 400 и выше вызывает ApiError.
+        """
+        response = self.session.request(method, urljoin(self.base_url, path), params=params, json=json,
+                                        timeout=self.timeout)
+        body: Any = self._decode(response)
+        if response.status_code >= 400:
+            raise ApiError(response.status_code, body)
+        return body
+
+    def paginate(self, path: str, params: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Функция paginate возвращает итератор по всем записям постраничного списка, запрашивая следующую
+        страницу по ссылке next только после обработки предыдущей.
+        """
+        page: Dict[str, Any] = self.request('GET', path, params={'limit': self.page_size, **(params or {})})
+        while True:
+            yield from page['results']
+            if not page.get('next'):
+                return
+            page = self.request('GET', page['next'])
+
+    def iter_nodes(self, **filters: Any) -> Iterator[Node]:
+        """
+        Функция iter_nodes возвращает итератор по действующим участникам сети с фильтрами contact__country,
+        contact__location, contact__location__country.
+        """
+        return self.paginate('trade_network/node/list', filters)
+
+    def get_nodes(self, ids: Iterable[int]) -> Dict[int, Node]:
+        """
+        Функция get_nodes возвращает словарь участников сети по первичным ключам, запрашивая их пакетами
+        по batch_size. Отсутствующие и неактивные участники в словарь не попадают.
+        """
+        unique: List[int] = list(dict.fromkeys(ids))
+        nodes: Dict[int, Node] = {}
+        for start in range(0, len(unique), self.batch_size):
+            batch: List[int] = unique[start:start + self.batch_size]
+            for node in self.paginate('trade_network/node/list', {'id__in': ','.join(map(str, batch))}):
+                nodes[node['id']] = node
+        return nodes
+
+    def get_node(self, pk: int) -> Node:
+        """
+        Функция get_node возвращает участника сети по первичному ключу.
+        """
+        return self.request('GET', f'trade_network/node/{pk}')
+
+    def create_node(self, name: str, supplier: Optional[str] = None, contact: Optional[Contact] = None) -> Node:
+        """
+        Функция create_node создает участника сети с контактом. Поставщик указывается именем.
+        """
+        data: Dict[str, Any] = {'name': name, 'contact': contact or {}}
+        if supplier is not None:
+            data['supplier'] = supplier
+        return self.request('POST', 'trade_network/node', json=data)
+
+    def update_node(self, pk: int, **fields: Any) -> Node:
+        """
+        Функция update_node изменяет указанные поля участника сети и его контакта (поле contact).
+        """
+        return self.request('PATCH', f'trade_network/node/{pk}', json=fields)
+
+    def delete_node(self, pk: int) -> None:
+        """
+        Функция delete_node помечает участника сети неактивным.
+        """
+        self.request('DELETE', f'trade_network/node/{pk}')
+
+    def country_stats(self) -> Iterator[LocationStats]:
+        """
+        Функция country_stats возвращает итератор по сводным показателям стран.
+        """
+        return self.paginate('trade_network/location/countries')
+
+    def city_stats(self, country: Optional[int] = None) -> Iterator[LocationStats]:
+        """
+        Функция city_stats возвращает итератор по сводным показателям городов, при необходимости одной страны.
+        """
+        return self.paginate('trade_network/location/cities', {'country': country} if country else None)
+
+    def product_price(self, pk: int, at: Optional[datetime] = None) -> PriceHistory:
+        """
+        Функция product_price возвращает цену продукта на момент at (по умолчанию - текущую).
+        """
+        return self.request('GET', f'trade_network/product/{pk}/price',
+                            params={'at': at.isoformat()} if at else None)
+
+    def price_series(self, interval: str = 'day', **params: Any) -> Iterator[PricePoint]:
+        """
+        Функция price_series возвращает итератор по временному ряду цен продукта (product), модели (model)
+        или продуктов владельца (owner) с границами start и end.
+        """
+        params = {key: value.isoformat() if isinstance(value, datetime) else value for key, value in params.items()}
+        return self.paginate('trade_network/product/price_history', {'interval': interval, **params})
+
+    def job(self, pk: int) -> Dict[str, Any]:
+        """
+        Функция job возвращает статус и прогресс фоновой задачи.
+        """
+        return self.request('GET', f'jobs/{pk}')
+
+    def schema(self) -> Dict[str, Any]:
+        """
+        Функция schema возвращает OpenAPI схему API.
+        """
+        response = self.session.get(urljoin(self.base_url, 'schema'), timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def _decode(self, response: requests.Response) -> Any:
+        if not response.content:
+            return None
+        if self._unpackb is not None and response.headers.get('Content-Type', '').startswith(MSGPACK_MEDIA_TYPE):
+            return self._unpackb(response.content, raw=False, timestamp=3)
+        try:
+            return response.json()
+        except ValueError:
+            return response.text
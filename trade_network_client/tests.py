@@ -0,0 +1,65 @@
+import json
+from typing import Any, Dict, List
+from unittest import TestCase, mock
+
+import requests
+
+from trade_network_client.client import ApiError, TradeNetworkClient
+
+
+def make_response(body: Any, status: int = 200) -> requests.Response:
+    """
+    The make_response function is a utility function. It returns a requests response with the JSON body.
+    """
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps(body).encode()
+    response.headers['Content-Type'] = 'application/json'
+    return response
+
+
+class TradeNetworkClientTestCase(TestCase):
+    """
+    Класс TradeNetworkClientTestCase наследуется от класса TestCase из модуля unittest.
+    Проверяет постраничное чтение списков по ссылкам next и пакетный запрос участников сети
+    с подмененной сессией requests.
+    """
+
+    def setUp(self) -> None:
+        self.session = mock.MagicMock(spec=requests.Session)
+        self.session.headers = {}
+        self.client = TradeNetworkClient('http://api.example.com', page_size=2, batch_size=2, session=self.session)
+
+    def requested(self) -> List[Dict[str, Any]]:
+        return [{'url': call.args[1], 'params': call.kwargs['params']} for call in self.session.request.call_args_list]
+
+    def test_paginate_follows_next(self) -> None:
+        next_url: str = 'http://api.example.com/trade_network/node/list?limit=2&offset=2'
+        self.session.request.side_effect = [
+            make_response({'results': [{'id': 1}, {'id': 2}], 'next': next_url}),
+            make_response({'results': [{'id': 3}], 'next': None}),
+        ]
+        nodes = self.client.iter_nodes(contact__country='Russia')
+        self.assertEqual([next(nodes), next(nodes)], [{'id': 1}, {'id': 2}])
+        self.assertEqual(self.session.request.call_count, 1)
+        self.assertEqual(list(nodes), [{'id': 3}])
+        self.assertEqual(self.requested(), [
+            {'url': 'http://api.example.com/trade_network/node/list',
+             'params': {'limit': 2, 'contact__country': 'Russia'}},
+            {'url': next_url, 'params': None},
+        ])
+
+    def test_get_nodes_in_batches(self) -> None:
+        self.session.request.side_effect = [
+            make_response({'results': [{'id': 1}, {'id': 2}], 'next': None}),
+            make_response({'results': [], 'next': None}),
+        ]
+        self.assertEqual(self.client.get_nodes([1, 2, 2, 3]), {1: {'id': 1}, 2: {'id': 2}})
+        self.assertEqual([request['params'] for request in self.requested()],
+                         [{'limit': 2, 'id__in': '1,2'}, {'limit': 2, 'id__in': '3'}])
+
+    def test_error_response(self) -> None:
+        self.session.request.return_value = make_response({'detail': 'Not found.'}, status=404)
+        with self.assertRaises(ApiError) as context:
+            self.client.get_node(1)
+        self.assertEqual((context.exception.status, context.exception.detail), (404, {'detail': 'Not found.'}))
@@ -1,9 +1,12 @@
 from django.contrib.auth.models import AbstractUser
+from django.db import models
 
 
 class User(AbstractUser):
     """
     Класс User является наследником класса AbstractUser из библиотеки django.contrib.auth.models.
     Это модель данных, содержащаяся в таблице базы данных user.
+    Поле chain - завод в корне цепочки поставок, которой ограничен доступ пользователя к торговой сети.
     """
-    pass
+    chain = models.ForeignKey('trade_network.Node', null=True, blank=True, on_delete=models.SET_NULL,
+                              related_name='users')
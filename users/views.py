@@ -4,27 +4,29 @@ from rest_framework.generics import CreateAPIView, RetrieveUpdateDestroyAPIView,
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
+from config.generics import LazySerializerMixin
 from users.models import User
-from users.serializers import UserCreateSerializer, LoginSerializer, UserSerializer, UpdatePasswordSerializer
 
 
-class UserCreateView(CreateAPIView):
+class UserCreateView(LazySerializerMixin, CreateAPIView):
     """
     Класс User Create View наследуется от класса CreateAPIView из модуля rest_framework.generics и представляет
     собой представление на основе класса для обработки запросов методами POST по адресу "/core/signup".
     """
     model = User
-    serializer_class = UserCreateSerializer
+    serializer_class = 'users.serializers.UserCreateSerializer'
     permission_classes: list = [AllowAny]
+    throttle_scope: str = 'users'
 
 
-class LoginView(CreateAPIView):
+class LoginView(LazySerializerMixin, CreateAPIView):
     """
     Класс LoginView наследуется от класса CreateAPIView из модуля rest_framework.generics и представляет
     собой представление на основе класса для обработки запросов методами POST по адресу "/core/login".
     """
-    serializer_class = LoginSerializer
+    serializer_class = 'users.serializers.LoginSerializer'
     permission_classes: list = [AllowAny]
+    throttle_scope: str = 'users'
 
     def post(self, request, *args, **kwargs) -> Response:
         """
@@ -39,15 +41,16 @@ class LoginView(CreateAPIView):
         return Response(serializer.data)
 
 
-class ProfileView(RetrieveUpdateDestroyAPIView):
+class ProfileView(LazySerializerMixin, RetrieveUpdateDestroyAPIView):
     """
     The ProfileView class inherits from the RetrieveUpdateDestroyAPIView class from the rest_framework.generics module
     and is a class-based view for processing requests with POST, PUT, PATCH and DELETE methods at the address
      '/core/profile'.
     """
-    serializer_class = UserSerializer
+    serializer_class = 'users.serializers.UserSerializer'
     queryset = User.objects.all()
     permission_classes = [IsAuthenticated]
+    throttle_scope = 'users'
 
     def get_object(self) -> User:
         """
@@ -67,14 +70,15 @@ class ProfileView(RetrieveUpdateDestroyAPIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class UpdatePasswordView(UpdateAPIView):
+class UpdatePasswordView(LazySerializerMixin, UpdateAPIView):
     """
     Класс представления пароля обновления наследуется от класса UpdateAPIView из модуля rest_framework.generics
     и представляет собой представление на основе класса для обработки запросов методами PUT и PATCH по адресу
      '/core/update_password'.
     """
     permission_classes = [IsAuthenticated]
-    serializer_class = UpdatePasswordSerializer
+    throttle_scope = 'users'
+    serializer_class = 'users.serializers.UpdatePasswordSerializer'
 
     def get_object(self):
         """